@@ -14,6 +14,7 @@ from celery import Celery
 from config import config
 from .extensions import db, jwt, limiter, ma
 from .utils.error_handlers import register_error_handlers
+from .utils.json_provider import ORJSONProvider, ORJSON_AVAILABLE
 from .utils.logging_config import setup_logging
 
 
@@ -37,6 +38,10 @@ def create_app(config_name: str = 'development') -> Flask:
     # Disable automatic trailing slash redirects that cause CORS issues
     app.url_map.strict_slashes = False
     
+    # Serialize JSON responses with orjson when available
+    if ORJSON_AVAILABLE:
+        app.json = ORJSONProvider(app)
+    
     # Initialize extensions
     init_extensions(app)
     
@@ -46,6 +51,10 @@ def create_app(config_name: str = 'development') -> Flask:
     # Register blueprints
     register_blueprints(app)
     
+    # Answer health probes at the WSGI layer
+    from .routes.health import HealthCheckMiddleware
+    app.wsgi_app = HealthCheckMiddleware(app.wsgi_app, '/api/health')
+    
     # Register error handlers
     register_error_handlers(app)
     
@@ -6,11 +6,12 @@ Represents legal cases and associated metadata.
 import uuid
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer
-from sqlalchemy.dialects.postgresql import UUID, ARRAY, ENUM
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer, Index, DDL, Computed, event
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, ENUM, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 
 from ..extensions import db
+from .video import AnalysisStatus
 
 
 class CaseStatus(Enum):
@@ -37,19 +38,19 @@ class Case(db.Model):
     __tablename__ = 'cases'
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    created_by = Column(UUID(as_uuid=True), nullable=False, index=True)  # References auth.users.id
+    created_by = Column(UUID(as_uuid=True), nullable=False)  # References auth.users.id
     
     # Case Information
     name = Column(String(200), nullable=False)
     description = Column(Text)
-    case_number = Column(String(100), index=True)  # Optional user-provided case number
+    case_number = Column(String(100))  # Optional user-provided case number
     
     # Incident Details
     incident_date = Column(DateTime)
     incident_location = Column(String(500))
     incident_description = Column(Text)
     
-    # Classification
+    # Classification (native Postgres enums, stored as 4-byte OIDs)
     status = Column(ENUM(CaseStatus), default=CaseStatus.PENDING, nullable=False)
     priority = Column(ENUM(CasePriority), default=CasePriority.MEDIUM, nullable=False)
     tags = Column(ARRAY(String), default=list)
@@ -59,11 +60,39 @@ class Case(db.Model):
     opposing_party = Column(String(200))
     legal_theory = Column(Text)
     
+    # Full-text search vector, maintained by Postgres from the searchable
+    # columns; deferred so ordinary loads never fetch it. Existing databases
+    # add it from DATABASE_MIGRATIONS.md (Step 1)
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '')"
+            " || ' ' || coalesce(case_number, '') || ' ' || coalesce(incident_location, ''))",
+            persisted=True
+        )
+    ))
+    
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     closed_at = Column(DateTime)
     
+    # Composite indexes matching the per-user access patterns of the case
+    # routes; each leads with created_by so no separate owner index is needed
+    __table_args__ = (
+        Index('ix_cases_created_by_created_at', created_by, created_at.desc(), id.desc()),
+        # Covers status and status+priority filtered listings and stats;
+        # supersedes a plain (created_by, status) index
+        Index('ix_cases_owner_status_priority_created',
+              created_by, status, priority, created_at.desc(),
+              postgresql_include=['name', 'case_number']),
+        Index('ix_cases_created_by_priority', created_by, priority),
+        # Serves equality and prefix (LIKE 'abc%') lookups on case_number
+        Index('ix_cases_case_number_pattern', case_number,
+              postgresql_ops={'case_number': 'varchar_pattern_ops'}),
+        Index('ix_cases_search_vector', search_vector, postgresql_using='gin'),
+    )
+    
     # Relationships
     videos = relationship('Video', backref='case', cascade='all, delete-orphan', lazy='dynamic')
     reports = relationship('Report', backref='case', cascade='all, delete-orphan', lazy='dynamic')
@@ -76,11 +105,22 @@ class Case(db.Model):
     @property
     def analysis_progress(self) -> dict:
         """Get analysis progress statistics."""
-        total_videos = self.video_count
+        return self._analysis_progress(self.videos.all())
+    
+    @staticmethod
+    def _analysis_progress(videos: list) -> dict:
+        """Compute analysis progress statistics from already-loaded videos."""
+        completed_analyses = sum(
+            1 for video in videos if video.analysis_status == AnalysisStatus.COMPLETED
+        )
+        return Case.progress_from_counts(len(videos), completed_analyses)
+    
+    @staticmethod
+    def progress_from_counts(total_videos: int, completed_analyses: int) -> dict:
+        """Build analysis progress statistics from video counts."""
         if total_videos == 0:
             return {'total': 0, 'completed': 0, 'percentage': 0}
         
-        completed_analyses = sum(1 for video in self.videos if video.analysis_status == 'completed')
         percentage = (completed_analyses / total_videos) * 100
         
         return {
@@ -89,10 +129,12 @@ class Case(db.Model):
             'percentage': round(percentage, 2)
         }
     
-
-    
     def to_dict(self, include_videos: bool = False) -> dict:
         """Convert case to dictionary."""
+        # The videos relationship is dynamic (query-per-access), so fetch it
+        # once and derive the count, progress and nested list from that
+        videos = self.videos.all()
+        
         result = {
             'id': str(self.id),
             'created_by': str(self.created_by),
@@ -111,14 +153,68 @@ class Case(db.Model):
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
             'closed_at': self.closed_at.isoformat() if self.closed_at else None,
-            'video_count': self.video_count,
-            'analysis_progress': self.analysis_progress
+            'video_count': len(videos),
+            'analysis_progress': self._analysis_progress(videos)
         }
         
         if include_videos:
-            result['videos'] = [video.to_dict() for video in self.videos]
+            result['videos'] = [video.to_dict() for video in videos]
         
         return result
     
     def __repr__(self) -> str:
-        return f'<Case {self.case_number}: {self.name}>' 
\ No newline at end of file
+        return f'<Case {self.case_number}: {self.name}>'
+
+
+# Text searched by get_cases: the searchable columns joined into one string.
+# Built from || and coalesce (both immutable) so it can be indexed.
+CASE_SEARCH_DOCUMENT = (
+    db.func.coalesce(Case.name, '') + ' ' +
+    db.func.coalesce(Case.description, '') + ' ' +
+    db.func.coalesce(Case.case_number, '') + ' ' +
+    db.func.coalesce(Case.incident_location, '')
+)
+
+# A single trigram index over the search document lets the '%term%' ILIKE
+# search (used for terms too short for full-text search) use one index
+# probe instead of OR-ing four column scans
+Index(
+    'ix_cases_search_trgm',
+    CASE_SEARCH_DOCUMENT.label('search_document'),
+    postgresql_using='gin',
+    postgresql_ops={'search_document': 'gin_trgm_ops'}
+)
+
+# The trigram operator classes used by the search index live in pg_trgm
+event.listen(
+    Case.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+
+
+# closed_at follows status changes in the database, so every write path
+# (routes, admin scripts, manual SQL) stamps and clears it the same way.
+# This hook only runs for freshly created tables; existing databases get the
+# same function and trigger from DATABASE_MIGRATIONS.md (Step 2)
+event.listen(
+    Case.__table__,
+    'after_create',
+    DDL("""
+        CREATE OR REPLACE FUNCTION set_case_closed_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.closed_at := CASE
+                WHEN NEW.status = 'CLOSED' THEN now() AT TIME ZONE 'utc'
+                ELSE NULL
+            END;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER cases_set_closed_at
+            BEFORE UPDATE OF status ON cases
+            FOR EACH ROW
+            WHEN (NEW.status IS DISTINCT FROM OLD.status)
+            EXECUTE FUNCTION set_case_closed_at();
+    """).execute_if(dialect='postgresql')
+)
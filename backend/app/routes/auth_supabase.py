@@ -3,14 +3,28 @@ Supabase Authentication Routes
 Handles authentication using Supabase Auth instead of custom user management.
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
+from sqlalchemy import update
 from ..extensions import db
 from ..models.profile import Profile, UserRole
 from ..services.supabase_auth import supabase_auth
-from ..utils.auth_decorators import supabase_jwt_required, get_current_user_id
+from ..utils.auth_decorators import supabase_jwt_required, get_current_user_id, get_current_user_uuid
 
 auth_supabase_bp = Blueprint('auth_supabase', __name__)
 
+# Fields a user may change through update_profile (role is handled separately)
+UPDATABLE_PROFILE_FIELDS = frozenset({
+    'first_name', 'last_name', 'organization', 'phone', 'bio',
+    'avatar_url', 'preferences'
+})
+
+# Role names accepted from clients; anything else falls back to attorney
+ROLES_BY_NAME = {
+    'attorney': UserRole.ATTORNEY,
+    'investigator': UserRole.INVESTIGATOR,
+    'admin': UserRole.ADMIN
+}
+
 
 @auth_supabase_bp.route('/verify-token', methods=['POST'])
 def verify_token():
@@ -72,11 +86,11 @@ def verify_token():
             'message': 'Token verified successfully'
         })
         
-    except Exception as e:
+    except Exception:
+        current_app.logger.exception('Token verification failed')
         return jsonify({
             'success': False,
-            'message': 'Token verification failed',
-            'error': str(e)
+            'message': 'Token verification failed'
         }), 500
 
 
@@ -118,11 +132,11 @@ def register():
             'message': 'Registration initiated. Please check your email for confirmation.'
         }), 201
         
-    except Exception as e:
+    except Exception:
+        current_app.logger.exception('Registration failed')
         return jsonify({
             'success': False,
-            'message': 'Registration failed',
-            'error': str(e)
+            'message': 'Registration failed'
         }), 500
 
 
@@ -172,11 +186,7 @@ def create_profile():
             })
         
         # Create profile in our database
-        role_enum = UserRole.ATTORNEY  # default
-        if role == 'investigator':
-            role_enum = UserRole.INVESTIGATOR
-        elif role == 'admin':
-            role_enum = UserRole.ADMIN
+        role_enum = ROLES_BY_NAME.get(role, UserRole.ATTORNEY)
         
         profile = Profile(
             id=user_id,
@@ -195,12 +205,12 @@ def create_profile():
             'message': 'Profile created successfully'
         }), 201
         
-    except Exception as e:
+    except Exception:
         db.session.rollback()
+        current_app.logger.exception('Failed to create profile')
         return jsonify({
             'success': False,
-            'message': 'Failed to create profile',
-            'error': str(e)
+            'message': 'Failed to create profile'
         }), 500
 
 
@@ -209,7 +219,7 @@ def create_profile():
 def get_profile():
     """Get current user's profile."""
     try:
-        user_id = get_current_user_id()
+        user_id = get_current_user_uuid()
         profile = Profile.query.filter_by(id=user_id).first()
         
         if not profile:
@@ -223,11 +233,11 @@ def get_profile():
             'data': profile.to_dict()
         })
         
-    except Exception as e:
+    except Exception:
+        current_app.logger.exception('Failed to get profile')
         return jsonify({
             'success': False,
-            'message': 'Failed to get profile',
-            'error': str(e)
+            'message': 'Failed to get profile'
         }), 500
 
 
@@ -236,15 +246,7 @@ def get_profile():
 def update_profile():
     """Update current user's profile."""
     try:
-        user_id = get_current_user_id()
-        profile = Profile.query.filter_by(id=user_id).first()
-        
-        if not profile:
-            return jsonify({
-                'success': False,
-                'message': 'Profile not found'
-            }), 404
-        
+        user_id = get_current_user_uuid()
         data = request.get_json()
         if not data:
             return jsonify({
@@ -252,46 +254,50 @@ def update_profile():
                 'message': 'No data provided'
             }), 400
         
+        if not isinstance(data, dict):
+            return jsonify({
+                'success': False,
+                'message': 'Request body must be a JSON object'
+            }), 400
+        
         # Update allowed fields
-        if 'first_name' in data:
-            profile.first_name = data['first_name']
-        if 'last_name' in data:
-            profile.last_name = data['last_name']
-        if 'organization' in data:
-            profile.organization = data['organization']
-        if 'phone' in data:
-            profile.phone = data['phone']
-        if 'bio' in data:
-            profile.bio = data['bio']
-        if 'avatar_url' in data:
-            profile.avatar_url = data['avatar_url']
-        if 'preferences' in data:
-            profile.preferences = data['preferences']
+        patch = {field: data[field] for field in data.keys() & UPDATABLE_PROFILE_FIELDS}
         
         # Handle role update (admin only in production)
         if 'role' in data:
-            role_value = data['role']
-            if role_value == 'investigator':
-                profile.role = UserRole.INVESTIGATOR
-            elif role_value == 'admin':
-                profile.role = UserRole.ADMIN
-            else:
-                profile.role = UserRole.ATTORNEY
+            patch['role'] = ROLES_BY_NAME.get(data['role'], UserRole.ATTORNEY)
+        
+        # Write straight through with UPDATE ... RETURNING instead of loading
+        # the profile and dirty-tracking each attribute
+        if patch:
+            profile = db.session.execute(
+                update(Profile).where(Profile.id == user_id).values(**patch).returning(Profile)
+            ).scalar_one_or_none()
+        else:
+            profile = Profile.query.filter_by(id=user_id).first()
+        
+        if not profile:
+            db.session.rollback()
+            return jsonify({
+                'success': False,
+                'message': 'Profile not found'
+            }), 404
         
+        profile_data = profile.to_dict()
         db.session.commit()
         
         return jsonify({
             'success': True,
-            'data': profile.to_dict(),
+            'data': profile_data,
             'message': 'Profile updated successfully'
         })
         
-    except Exception as e:
+    except Exception:
         db.session.rollback()
+        current_app.logger.exception('Failed to update profile')
         return jsonify({
             'success': False,
-            'message': 'Failed to update profile',
-            'error': str(e)
+            'message': 'Failed to update profile'
         }), 500
 
 
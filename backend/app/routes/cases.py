@@ -1,94 +1,369 @@
 """Cases Routes"""
-from flask import Blueprint, jsonify, request
+import base64
+import binascii
+import math
+import re
+from itertools import chain
+from uuid import UUID
+from flask import Blueprint, Response, current_app, json, jsonify, request, stream_with_context
+from sqlalchemy import insert, update, delete, select, exists, tuple_, func, case as sql_case
 from sqlalchemy.exc import SQLAlchemyError
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from ..models.case import Case, CaseStatus, CasePriority
+from ..models.case import Case, CaseStatus, CasePriority, CASE_SEARCH_DOCUMENT
+from ..models.video import Video, AnalysisStatus
+from ..models.report import Report
 from ..extensions import db
-from ..utils.auth_decorators import supabase_jwt_required, get_current_user_id
+from ..services.redis_service import redis_service
+from ..utils.auth_decorators import supabase_jwt_required, get_current_user_uuid
+from ..utils.feature_flags import feature_required
+from ..utils.json_provider import dumps_bytes
+
+# ciso8601 is a C parser that accepts a trailing 'Z' directly; Python 3.11's
+# fromisoformat handles it too, so it is the fallback when ciso8601 is absent
+try:
+    from ciso8601 import parse_datetime as parse_iso_datetime
+except ImportError:
+    parse_iso_datetime = datetime.fromisoformat
 
 cases_bp = Blueprint('cases', __name__)
 
+# Value -> member lookups used to validate and coerce request strings
+CASE_STATUS_BY_VALUE = {status.value: status for status in CaseStatus}
+CASE_PRIORITY_BY_VALUE = {priority.value: priority for priority in CasePriority}
+CASE_ENUM_FIELDS = (
+    ('status', CASE_STATUS_BY_VALUE),
+    ('priority', CASE_PRIORITY_BY_VALUE),
+)
+
+
+def _enum_converter(field, lookup):
+    """Build a converter mapping a request string to its enum member."""
+    def convert(value):
+        if isinstance(value, str) and value in lookup:
+            return lookup[value]
+        raise ValueError(f'Invalid {field}: {value}')
+    return convert
+
+
+def _convert_incident_date(value):
+    """Parse an ISO 8601 incident_date; empty values clear the field."""
+    if not value:
+        return None
+    try:
+        return parse_iso_datetime(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError('Invalid incident_date format. Use ISO 8601 format.') from e
+
+
+# Fields a client may change through update_case, mapped to the converter
+# that validates and coerces the request value (None = stored as given)
+CASE_FIELD_CONVERTERS = {
+    'name': None,
+    'description': None,
+    'case_number': None,
+    'incident_date': _convert_incident_date,
+    'incident_location': None,
+    'incident_description': None,
+    'status': _enum_converter('status', CASE_STATUS_BY_VALUE),
+    'priority': _enum_converter('priority', CASE_PRIORITY_BY_VALUE),
+    'tags': None,
+    'court_jurisdiction': None,
+    'opposing_party': None,
+    'legal_theory': None
+}
+UPDATABLE_CASE_FIELDS = frozenset(CASE_FIELD_CONVERTERS)
+
+# With CASE_FULL_TEXT_SEARCH on, searches at least this long use the
+# full-text index; shorter ones fall back to the trigram ILIKE
+MIN_FULL_TEXT_SEARCH_LENGTH = 3
+SEARCH_WORD_PATTERN = re.compile(r'[^\W_]+')
+
+# Page-number listings count at most this many matches; beyond it the total
+# is reported as a lower bound rather than scanning every row
+CASE_COUNT_CAP = 1000
+
+# Rows fetched per round trip while streaming case lists
+STREAM_BATCH_SIZE = 50
+
+
+def _validate_enum_fields(values, required=False):
+    """
+    Check status/priority values against the enum lookups.
+    
+    Args:
+        values: Request data or query args
+        required: Validate keys that are present even when falsy; otherwise
+            empty values are treated as "no filter"
+        
+    Returns:
+        A 400 response for the first invalid value, or None if all are valid
+    """
+    for field, lookup in CASE_ENUM_FIELDS:
+        value = values.get(field)
+        if (value or (required and field in values)) and not (
+            isinstance(value, str) and value in lookup
+        ):
+            return jsonify({
+                'success': False,
+                'message': f'Invalid {field}: {value}'
+            }), 400
+    return None
+
+
+def _owned_case_criteria(case_id, user_id):
+    """WHERE criteria matching a case only if it belongs to the given user."""
+    return (Case.id == case_id, Case.created_by == user_id)
+
+
+# The case table's own columns, without the derived search index
+CASE_TABLE_COLUMNS = tuple(
+    column for column in Case.__table__.columns if column.name != 'search_vector'
+)
+
+# Columns projected for case listings: the case row plus its video counts,
+# fetched without building ORM instances
+CASE_LIST_COLUMNS = (
+    *CASE_TABLE_COLUMNS,
+    select(func.count(Video.id))
+    .where(Video.case_id == Case.id)
+    .scalar_subquery()
+    .label('video_count'),
+    select(func.count(Video.id))
+    .where(Video.case_id == Case.id, Video.analysis_status == AnalysisStatus.COMPLETED)
+    .scalar_subquery()
+    .label('completed_count'),
+)
+
+
+def _serialize_case_row(row, video_count=None, completed_count=None):
+    """
+    Serialize a case row to the same shape as Case.to_dict().
+    
+    The video counts come from the row's CASE_LIST_COLUMNS labels unless
+    given explicitly (for rows holding only CASE_TABLE_COLUMNS).
+    """
+    if video_count is None:
+        video_count, completed_count = row.video_count, row.completed_count
+    return {
+        'id': str(row.id),
+        'created_by': str(row.created_by),
+        'name': row.name,
+        'description': row.description,
+        'case_number': row.case_number,
+        'incident_date': row.incident_date.isoformat() if row.incident_date else None,
+        'incident_location': row.incident_location,
+        'incident_description': row.incident_description,
+        'status': row.status.value if row.status else None,
+        'priority': row.priority.value if row.priority else None,
+        'tags': row.tags or [],
+        'court_jurisdiction': row.court_jurisdiction,
+        'opposing_party': row.opposing_party,
+        'legal_theory': row.legal_theory,
+        'created_at': row.created_at.isoformat(),
+        'updated_at': row.updated_at.isoformat(),
+        'closed_at': row.closed_at.isoformat() if row.closed_at else None,
+        'video_count': video_count,
+        'analysis_progress': Case.progress_from_counts(video_count, completed_count)
+    }
+
+
+def _prefix_tsquery(search):
+    """
+    Build a to_tsquery expression matching every word of a search as a prefix.
+    
+    Only word characters are kept, so user input cannot inject tsquery syntax.
+    Returns an empty string if the search contains no words.
+    """
+    return ' & '.join(f'{word}:*' for word in SEARCH_WORD_PATTERN.findall(search))
+
+
+def _revalidate(response, etag=None):
+    """
+    Mark a per-user response as cacheable only with revalidation.
+    
+    Clients may keep the body but must send If-None-Match on every use; an
+    unchanged resource then costs a 304 instead of a full response.
+    """
+    if etag:
+        response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def _encode_cursor(case):
+    """Encode a case's (created_at, id) sort key as an opaque page cursor."""
+    key = json.dumps([case.created_at.isoformat(), str(case.id)])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def _decode_cursor(cursor):
+    """
+    Decode a page cursor back into its (created_at, id) sort key.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, case_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return parse_iso_datetime(created_at), UUID(case_id)
+    except (binascii.Error, TypeError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def _stream_case_list(stmt, per_page, pagination):
+    """
+    Run a case list query and return a generator streaming its response.
+    
+    Rows are pulled from a server-side cursor STREAM_BATCH_SIZE at a time and
+    each batch is written out as a single bytes chunk, so neither the rows
+    nor the full JSON body are held in memory.
+    The query runs and its first batch is fetched here, before the response
+    starts, so failures at that point still reach the route's error handling.
+    The statement is expected to fetch one row past the page; its presence
+    sets has_next and the page's last row becomes next_cursor.
+    """
+    rows = db.session.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+    try:
+        batches = rows.partitions()
+        first_batch = next(batches, [])
+    except Exception:
+        rows.close()
+        raise
+    return _generate_case_list(rows, chain([first_batch], batches), per_page, pagination)
+
+
+def _generate_case_list(rows, batches, per_page, pagination):
+    """Yield the JSON body of a case list from already-started row batches."""
+    try:
+        yield b'{"success":true,"data":{"cases":['
+        last_case = None
+        has_next = False
+        emitted = 0
+        for batch in batches:
+            if emitted + len(batch) > per_page:
+                has_next = True
+                batch = batch[:per_page - emitted]
+            if batch:
+                chunk = b','.join(dumps_bytes(_serialize_case_row(case)) for case in batch)
+                yield b',' + chunk if emitted else chunk
+                emitted += len(batch)
+                last_case = batch[-1]
+            if has_next:
+                break
+        
+        pagination['has_next'] = has_next
+        pagination['next_cursor'] = _encode_cursor(last_case) if has_next else None
+        yield b'],"pagination":' + dumps_bytes(pagination) + b'}}'
+    except Exception:
+        # Headers are already sent; log and abort the connection rather than
+        # finishing a truncated body
+        current_app.logger.exception('Error streaming cases')
+        raise
+    finally:
+        rows.close()
+
+
 @cases_bp.route('/', methods=['GET'])
 @supabase_jwt_required
 def get_cases():
     """Get all cases for the current user with pagination and filtering."""
     try:
-        current_user_id = get_current_user_id()
+        current_user_id = get_current_user_uuid()
         
         # Get query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 10, type=int), 100)
+        cursor = request.args.get('cursor')
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = max(min(request.args.get('per_page', 10, type=int), 100), 1)
         status = request.args.get('status')
         priority = request.args.get('priority')
         search = request.args.get('search', '').strip()
         
         # Build query
-        query = Case.query.filter_by(created_by=current_user_id)
+        query = select(*CASE_LIST_COLUMNS).where(Case.created_by == current_user_id)
         
         # Apply filters
+        error_response = _validate_enum_fields(request.args)
+        if error_response:
+            return error_response
+        
         if status:
-            try:
-                status_enum = CaseStatus(status)
-                query = query.filter(Case.status == status_enum)
-            except ValueError:
-                return jsonify({
-                    'success': False,
-                    'message': f'Invalid status: {status}'
-                }), 400
+            query = query.where(Case.status == CASE_STATUS_BY_VALUE[status])
         
         if priority:
+            query = query.where(Case.priority == CASE_PRIORITY_BY_VALUE[priority])
+        
+        if search:
+            # Full-text search needs the search_vector column, which is added by
+            # hand (DATABASE_MIGRATIONS.md); until then every search uses ILIKE
+            use_full_text = (
+                current_app.config.get('CASE_FULL_TEXT_SEARCH', False)
+                and len(search) >= MIN_FULL_TEXT_SEARCH_LENGTH
+            )
+            tsquery = _prefix_tsquery(search) if use_full_text else ''
+            if tsquery:
+                query = query.where(
+                    Case.search_vector.op('@@')(func.to_tsquery('simple', tsquery))
+                )
+            else:
+                query = query.where(CASE_SEARCH_DOCUMENT.ilike(f'%{search}%'))
+        
+        # Order by most recent first; id breaks ties so the order is total
+        query = query.order_by(Case.created_at.desc(), Case.id.desc())
+        
+        if cursor:
+            # Keyset pagination: seek past the last row of the previous page
+            # using the (created_by, created_at, id) index, with no OFFSET scan
+            # and no COUNT(*)
             try:
-                priority_enum = CasePriority(priority)
-                query = query.filter(Case.priority == priority_enum)
+                last_created_at, last_id = _decode_cursor(cursor)
             except ValueError:
                 return jsonify({
                     'success': False,
-                    'message': f'Invalid priority: {priority}'
+                    'message': 'Invalid cursor'
                 }), 400
-        
-        if search:
-            search_filter = f'%{search}%'
-            query = query.filter(
-                db.or_(
-                    Case.name.ilike(search_filter),
-                    Case.description.ilike(search_filter),
-                    Case.case_number.ilike(search_filter),
-                    Case.incident_location.ilike(search_filter)
-                )
+            
+            query = query.where(
+                tuple_(Case.created_at, Case.id) < tuple_(last_created_at, last_id)
             )
+            pagination = {
+                'per_page': per_page,
+                'has_prev': True
+            }
+        else:
+            # Page-number pagination; the LIMIT inside the count bounds its scan
+            counted = db.session.execute(
+                select(func.count()).select_from(
+                    query.with_only_columns(Case.id)
+                    .order_by(None)
+                    .limit(CASE_COUNT_CAP + 1)
+                    .subquery()
+                )
+            ).scalar()
+            total = min(counted, CASE_COUNT_CAP)
+            query = query.offset((page - 1) * per_page)
+            pagination = {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'total_is_lower_bound': counted > CASE_COUNT_CAP,
+                'pages': math.ceil(total / per_page) if total else 0,
+                'has_prev': page > 1
+            }
         
-        # Order by most recent first
-        query = query.order_by(Case.created_at.desc())
+        page_query = query.limit(per_page + 1)
         
-        # Paginate
-        pagination = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        return Response(
+            stream_with_context(_stream_case_list(page_query, per_page, pagination)),
+            mimetype='application/json'
         )
         
-        cases = [case.to_dict() for case in pagination.items]
-        
-        return jsonify({
-            'success': True,
-            'data': {
-                'cases': cases,
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': pagination.total,
-                    'pages': pagination.pages,
-                    'has_next': pagination.has_next,
-                    'has_prev': pagination.has_prev
-                }
-            }
-        })
-        
-    except Exception as e:
+    except Exception:
+        current_app.logger.exception('Error retrieving cases')
         return jsonify({
             'success': False,
-            'message': f'Error retrieving cases: {str(e)}'
+            'message': 'Error retrieving cases'
         }), 500
 
 @cases_bp.route('/', methods=['POST'])
@@ -96,7 +371,7 @@ def get_cases():
 def create_case():
     """Create a new case."""
     try:
-        current_user_id = get_current_user_id()
+        current_user_id = get_current_user_uuid()
         data = request.get_json()
         
         if not data:
@@ -115,72 +390,66 @@ def create_case():
                 }), 400
         
         # Validate enums if provided
-        if 'status' in data:
-            try:
-                CaseStatus(data['status'])
-            except ValueError:
-                return jsonify({
-                    'success': False,
-                    'message': f'Invalid status: {data["status"]}'
-                }), 400
-        
-        if 'priority' in data:
-            try:
-                CasePriority(data['priority'])
-            except ValueError:
-                return jsonify({
-                    'success': False,
-                    'message': f'Invalid priority: {data["priority"]}'
-                }), 400
+        error_response = _validate_enum_fields(data, required=True)
+        if error_response:
+            return error_response
         
         # Parse incident_date if provided
-        incident_date = None
-        if data.get('incident_date'):
-            try:
-                incident_date = datetime.fromisoformat(data['incident_date'].replace('Z', '+00:00'))
-            except ValueError:
-                return jsonify({
-                    'success': False,
-                    'message': 'Invalid incident_date format. Use ISO 8601 format.'
-                }), 400
+        try:
+            incident_date = _convert_incident_date(data.get('incident_date'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
         
-        # Create new case
-        case = Case(
-            created_by=current_user_id,
-            name=data['name'],
-            description=data.get('description'),
-            case_number=data.get('case_number'),  # User-provided case number
-            incident_date=incident_date,
-            incident_location=data.get('incident_location'),
-            incident_description=data.get('incident_description'),
-            status=CaseStatus(data.get('status', 'pending')),
-            priority=CasePriority(data.get('priority', 'medium')),
-            tags=data.get('tags', []),
-            court_jurisdiction=data.get('court_jurisdiction'),
-            opposing_party=data.get('opposing_party'),
-            legal_theory=data.get('legal_theory')
-        )
+        # Create new case; INSERT ... RETURNING hands back the stored row
+        # (defaults included) without an ORM flush or refresh SELECT. Only the
+        # table columns are returned: the count subqueries would not correlate
+        # to the inserted row, and a new case has no videos anyway
+        row = db.session.execute(
+            insert(Case.__table__)
+            .values(
+                created_by=current_user_id,
+                name=data['name'],
+                description=data.get('description'),
+                case_number=data.get('case_number'),  # User-provided case number
+                incident_date=incident_date,
+                incident_location=data.get('incident_location'),
+                incident_description=data.get('incident_description'),
+                status=CASE_STATUS_BY_VALUE[data.get('status', 'pending')],
+                priority=CASE_PRIORITY_BY_VALUE[data.get('priority', 'medium')],
+                tags=data.get('tags', []),
+                court_jurisdiction=data.get('court_jurisdiction'),
+                opposing_party=data.get('opposing_party'),
+                legal_theory=data.get('legal_theory')
+            )
+            .returning(*CASE_TABLE_COLUMNS)
+        ).one()
+        case_data = _serialize_case_row(row, video_count=0, completed_count=0)
         
-        db.session.add(case)
         db.session.commit()
+        redis_service.invalidate_case_stats(current_user_id)
         
         return jsonify({
             'success': True,
-            'data': case.to_dict(),
+            'data': case_data,
             'message': 'Case created successfully'
         }), 201
         
-    except SQLAlchemyError as e:
+    except SQLAlchemyError:
         db.session.rollback()
+        current_app.logger.exception('Database error')
         return jsonify({
             'success': False,
-            'message': f'Database error: {str(e)}'
+            'message': 'Database error'
         }), 500
-    except Exception as e:
+    except Exception:
         db.session.rollback()
+        current_app.logger.exception('Error creating case')
         return jsonify({
             'success': False,
-            'message': f'Error creating case: {str(e)}'
+            'message': 'Error creating case'
         }), 500
 
 @cases_bp.route('/<case_id>', methods=['GET'])
@@ -188,31 +457,55 @@ def create_case():
 def get_case(case_id):
     """Get a specific case by ID."""
     try:
-        current_user_id = get_current_user_id()
+        current_user_id = get_current_user_uuid()
         
-        case = Case.query.filter_by(
-            id=case_id,
-            created_by=current_user_id
+        # Include videos in the response
+        include_videos = request.args.get('include_videos', 'false').lower() == 'true'
+        
+        # The case's updated_at plus its videos' count and latest update act
+        # as the version; a matching If-None-Match skips loading the case
+        version = db.session.execute(
+            select(Case.updated_at, func.count(Video.id), func.max(Video.updated_at))
+            .outerjoin(Video, Video.case_id == Case.id)
+            .where(*_owned_case_criteria(case_id, current_user_id))
+            .group_by(Case.id)
         ).first()
         
+        if version:
+            updated_at, video_count, videos_updated_at = version
+            etag = '-'.join((
+                str(updated_at.timestamp() if updated_at else 0),
+                str(video_count),
+                str(videos_updated_at.timestamp() if videos_updated_at else 0),
+                'v' if include_videos else 'c'
+            ))
+            if request.if_none_match.contains_weak(etag):
+                return _revalidate(Response(status=304), etag)
+            
+            case = Case.query.filter_by(
+                id=case_id,
+                created_by=current_user_id
+            ).first()
+        else:
+            case = None
+        
         if not case:
             return jsonify({
                 'success': False,
                 'message': 'Case not found'
             }), 404
         
-        # Include videos in the response
-        include_videos = request.args.get('include_videos', 'false').lower() == 'true'
-        
-        return jsonify({
+        response = jsonify({
             'success': True,
             'data': case.to_dict(include_videos=include_videos)
         })
+        return _revalidate(response, etag)
         
-    except Exception as e:
+    except Exception:
+        current_app.logger.exception('Error retrieving case')
         return jsonify({
             'success': False,
-            'message': f'Error retrieving case: {str(e)}'
+            'message': 'Error retrieving case'
         }), 500
 
 @cases_bp.route('/<case_id>', methods=['PUT'])
@@ -220,7 +513,7 @@ def get_case(case_id):
 def update_case(case_id):
     """Update a specific case."""
     try:
-        current_user_id = get_current_user_id()
+        current_user_id = get_current_user_uuid()
         data = request.get_json()
         
         if not data:
@@ -229,85 +522,63 @@ def update_case(case_id):
                 'message': 'No data provided'
             }), 400
         
-        case = Case.query.filter_by(
-            id=case_id,
-            created_by=current_user_id
-        ).first()
+        if not isinstance(data, dict):
+            return jsonify({
+                'success': False,
+                'message': 'Request body must be a JSON object'
+            }), 400
+        
+        # Validate and coerce update fields in one pass
+        patch = {}
+        try:
+            for field in data.keys() & UPDATABLE_CASE_FIELDS:
+                convert = CASE_FIELD_CONVERTERS[field]
+                patch[field] = convert(data[field]) if convert else data[field]
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        # Ownership check and write happen in a single UPDATE ... RETURNING
+        criteria = _owned_case_criteria(case_id, current_user_id)
+        if patch:
+            stmt = update(Case).where(*criteria).values(**patch).returning(Case)
+        else:
+            stmt = select(Case).where(*criteria)
+        case = db.session.execute(stmt).scalar_one_or_none()
         
         if not case:
+            db.session.rollback()
             return jsonify({
                 'success': False,
                 'message': 'Case not found'
             }), 404
         
-        # Validate enums if provided
-        if 'status' in data:
-            try:
-                CaseStatus(data['status'])
-            except ValueError:
-                return jsonify({
-                    'success': False,
-                    'message': f'Invalid status: {data["status"]}'
-                }), 400
-        
-        if 'priority' in data:
-            try:
-                CasePriority(data['priority'])
-            except ValueError:
-                return jsonify({
-                    'success': False,
-                    'message': f'Invalid priority: {data["priority"]}'
-                }), 400
-        
-        # Parse incident_date if provided
-        if 'incident_date' in data and data['incident_date']:
-            try:
-                data['incident_date'] = datetime.fromisoformat(data['incident_date'].replace('Z', '+00:00'))
-            except ValueError:
-                return jsonify({
-                    'success': False,
-                    'message': 'Invalid incident_date format. Use ISO 8601 format.'
-                }), 400
-        
-        # Update fields
-        updatable_fields = [
-            'name', 'description', 'case_number', 'incident_date', 'incident_location',
-            'incident_description', 'status', 'priority', 'tags',
-            'court_jurisdiction', 'opposing_party', 'legal_theory'
-        ]
-        
-        for field in updatable_fields:
-            if field in data:
-                if field in ['status', 'priority']:
-                    setattr(case, field, CaseStatus(data[field]) if field == 'status' else CasePriority(data[field]))
-                else:
-                    setattr(case, field, data[field])
-        
-        # Set closed_at if status is closed
-        if 'status' in data and data['status'] == 'closed' and not case.closed_at:
-            case.closed_at = datetime.utcnow()
-        elif 'status' in data and data['status'] != 'closed':
-            case.closed_at = None
-        
+        case_data = case.to_dict()
         db.session.commit()
+        if patch:
+            redis_service.invalidate_case_stats(current_user_id)
         
         return jsonify({
             'success': True,
-            'data': case.to_dict(),
+            'data': case_data,
             'message': 'Case updated successfully'
         })
         
-    except SQLAlchemyError as e:
+    except SQLAlchemyError:
         db.session.rollback()
+        current_app.logger.exception('Database error')
         return jsonify({
             'success': False,
-            'message': f'Database error: {str(e)}'
+            'message': 'Database error'
         }), 500
-    except Exception as e:
+    except Exception:
         db.session.rollback()
+        current_app.logger.exception('Error updating case')
         return jsonify({
             'success': False,
-            'message': f'Error updating case: {str(e)}'
+            'message': 'Error updating case'
         }), 500
 
 @cases_bp.route('/<case_id>', methods=['DELETE'])
@@ -315,45 +586,68 @@ def update_case(case_id):
 def delete_case(case_id):
     """Delete a specific case."""
     try:
-        current_user_id = get_current_user_id()
+        current_user_id = get_current_user_uuid()
         
-        case = Case.query.filter_by(
-            id=case_id,
-            created_by=current_user_id
-        ).first()
-        
-        if not case:
-            return jsonify({
-                'success': False,
-                'message': 'Case not found'
-            }), 404
+        # Only owned cases without videos are deletable; both conditions are
+        # part of the DELETE itself so there is no separate lookup.
+        criteria = _owned_case_criteria(case_id, current_user_id) + (
+            ~exists().where(Video.case_id == Case.id),
+        )
         
-        # Check if case has videos
-        if case.video_count > 0:
+        # Reports are removed alongside the case (ORM cascade equivalent) in a
+        # data-modifying CTE, so the whole delete is a single statement; the
+        # reports FK is checked at end of statement, after both deletes
+        deleted_reports = (
+            delete(Report)
+            .where(Report.case_id.in_(select(Case.id).where(*criteria)))
+            .returning(Report.id)
+            .cte('deleted_reports')
+        )
+        deleted_id = db.session.execute(
+            delete(Case)
+            .where(*criteria)
+            .add_cte(deleted_reports)
+            .returning(Case.id)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        
+        if deleted_id is None:
+            # Nothing was deleted: one lookup tells "not yours" from "has videos"
+            db.session.rollback()
+            owned = db.session.execute(
+                select(exists().where(*_owned_case_criteria(case_id, current_user_id)))
+            ).scalar()
+            if not owned:
+                return jsonify({
+                    'success': False,
+                    'message': 'Case not found'
+                }), 404
             return jsonify({
                 'success': False,
                 'message': 'Cannot delete case with associated videos. Delete videos first.'
             }), 400
         
-        db.session.delete(case)
         db.session.commit()
+        redis_service.invalidate_case_stats(current_user_id)
         
         return jsonify({
             'success': True,
             'message': 'Case deleted successfully'
         })
         
-    except SQLAlchemyError as e:
+    except SQLAlchemyError:
         db.session.rollback()
+        current_app.logger.exception('Database error')
         return jsonify({
             'success': False,
-            'message': f'Database error: {str(e)}'
+            'message': 'Database error'
         }), 500
-    except Exception as e:
+    except Exception:
         db.session.rollback()
+        current_app.logger.exception('Error deleting case')
         return jsonify({
             'success': False,
-            'message': f'Error deleting case: {str(e)}'
+            'message': 'Error deleting case'
         }), 500
 
 @cases_bp.route('/stats', methods=['GET'])
@@ -361,67 +655,80 @@ def delete_case(case_id):
 def get_case_stats():
     """Get case statistics for the current user."""
     try:
-        current_user_id = get_current_user_id()
-        
-        # Get basic counts
-        total_cases = Case.query.filter_by(created_by=current_user_id).count()
-        
-        # Get counts by status
-        status_counts = {}
-        for status in CaseStatus:
-            count = Case.query.filter_by(
-                created_by=current_user_id,
-                status=status
-            ).count()
-            status_counts[status.value] = count
-        
-        # Get counts by priority
-        priority_counts = {}
-        for priority in CasePriority:
-            count = Case.query.filter_by(
-                created_by=current_user_id,
-                priority=priority
-            ).count()
-            priority_counts[priority.value] = count
-        
-        # Get recent activity (cases created in last 30 days)
-        from datetime import timedelta
+        current_user_id = get_current_user_uuid()
+        
+        # Stats only change when the user's cases are written, and every write
+        # route invalidates this entry
+        cached_stats = redis_service.get_cached_case_stats(current_user_id)
+        if cached_stats is not None:
+            response = jsonify({
+                'success': True,
+                'data': cached_stats
+            })
+            response.add_etag(weak=True)
+            return _revalidate(response).make_conditional(request)
+        
+        # One grouped scan returns every (status, priority) bucket along with
+        # how many of its cases were created in the last 30 days
         thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_cases = Case.query.filter(
-            Case.created_by == current_user_id,
-            Case.created_at >= thirty_days_ago
-        ).count()
-        
-        return jsonify({
+        rows = db.session.execute(
+            select(
+                Case.status,
+                Case.priority,
+                func.count(),
+                func.sum(sql_case((Case.created_at >= thirty_days_ago, 1), else_=0))
+            )
+            .where(Case.created_by == current_user_id)
+            .group_by(Case.status, Case.priority)
+        ).all()
+        
+        status_counts = dict.fromkeys((status.value for status in CaseStatus), 0)
+        priority_counts = dict.fromkeys((priority.value for priority in CasePriority), 0)
+        total_cases = 0
+        recent_cases = 0
+        for status, priority, count, recent in rows:
+            status_counts[status.value] += count
+            priority_counts[priority.value] += count
+            total_cases += count
+            recent_cases += recent or 0
+        
+        stats = {
+            'total_cases': total_cases,
+            'status_counts': status_counts,
+            'priority_counts': priority_counts,
+            'recent_cases': recent_cases
+        }
+        redis_service.cache_case_stats(current_user_id, stats)
+        
+        # Stats have no cheap version column, so the ETag is a hash of the body
+        response = jsonify({
             'success': True,
-            'data': {
-                'total_cases': total_cases,
-                'status_counts': status_counts,
-                'priority_counts': priority_counts,
-                'recent_cases': recent_cases
-            }
+            'data': stats
         })
+        response.add_etag(weak=True)
+        return _revalidate(response).make_conditional(request)
         
-    except Exception as e:
+    except Exception:
+        current_app.logger.exception('Error retrieving case statistics')
         return jsonify({
             'success': False,
-            'message': f'Error retrieving case statistics: {str(e)}'
+            'message': 'Error retrieving case statistics'
         }), 500
 
 @cases_bp.route('/<case_id>/videos', methods=['GET'])
+@feature_required('VIDEOS_ENABLED')
 @supabase_jwt_required
 def get_case_videos(case_id):
     """Get all videos for a specific case."""
     try:
-        current_user_id = get_current_user_id()
+        current_user_id = get_current_user_uuid()
         
-        # Verify case ownership
-        case = Case.query.filter_by(
-            id=case_id,
-            created_by=current_user_id
-        ).first()
+        # Verify case ownership without loading the row
+        owned = db.session.execute(
+            select(exists().where(*_owned_case_criteria(case_id, current_user_id)))
+        ).scalar()
         
-        if not case:
+        if not owned:
             return jsonify({
                 'success': False,
                 'message': 'Case not found'
@@ -448,8 +755,9 @@ def get_case_videos(case_id):
             }
         })
         
-    except Exception as e:
+    except Exception:
+        current_app.logger.exception('Error retrieving case videos')
         return jsonify({
             'success': False,
-            'message': f'Error retrieving case videos: {str(e)}'
+            'message': 'Error retrieving case videos'
         }), 500 
\ No newline at end of file
@@ -1,13 +1,52 @@
 """Health Check Routes"""
+import json
 from flask import Blueprint, jsonify
 
 health_bp = Blueprint('health', __name__)
 
+HEALTH_PAYLOAD = {
+    'success': True,
+    'message': 'Video Analyzer API is running',
+    'status': 'healthy'
+}
+
+# Precomputed probe response served by HealthCheckMiddleware
+HEALTH_BODY = json.dumps(HEALTH_PAYLOAD).encode()
+HEALTH_HEADERS = [
+    ('Content-Type', 'application/json'),
+    ('Content-Length', str(len(HEALTH_BODY))),
+    ('Cache-Control', 'public, max-age=10'),
+]
+
+
+class HealthCheckMiddleware:
+    """
+    WSGI middleware answering health probes before Flask sees them.
+    
+    Liveness/readiness probes and load balancers hit the health endpoint
+    constantly; answering them here skips routing, request context setup,
+    JSON encoding and teardown. Browser requests (which carry an Origin
+    header and need CORS headers) still fall through to the Flask route.
+    """
+    
+    def __init__(self, wsgi_app, path: str):
+        self.wsgi_app = wsgi_app
+        self.path = path
+    
+    def __call__(self, environ, start_response):
+        if (environ.get('PATH_INFO') == self.path
+                and environ.get('REQUEST_METHOD') in ('GET', 'HEAD')
+                and 'HTTP_ORIGIN' not in environ):
+            start_response('200 OK', HEALTH_HEADERS)
+            return [] if environ['REQUEST_METHOD'] == 'HEAD' else [HEALTH_BODY]
+        return self.wsgi_app(environ, start_response)
+
+
 @health_bp.route('/health')
 def health_check():
     """Health check endpoint."""
-    return jsonify({
-        'success': True,
-        'message': 'Video Analyzer API is running',
-        'status': 'healthy'
-    }) 
\ No newline at end of file
+    response = jsonify(HEALTH_PAYLOAD)
+    # Constant body: let probes and proxies reuse it briefly
+    response.cache_control.public = True
+    response.cache_control.max_age = 10
+    return response
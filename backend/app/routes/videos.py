@@ -1,10 +1,12 @@
 """Videos Routes"""
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from ..utils.auth_decorators import supabase_jwt_required, get_current_user_id
+from ..utils.feature_flags import feature_required
 
 videos_bp = Blueprint('videos', __name__)
 
 @videos_bp.route('/', methods=['GET'])
+@feature_required('VIDEOS_ENABLED')
 @supabase_jwt_required
 def get_all_videos():
     """Get all videos for the current user."""
@@ -33,10 +35,11 @@ def get_all_videos():
             }
         })
         
-    except Exception as e:
+    except Exception:
+        current_app.logger.exception('Error retrieving videos')
         return jsonify({
             'success': False,
-            'message': f'Error retrieving videos: {str(e)}'
+            'message': 'Error retrieving videos'
         }), 500
 
 @videos_bp.route('/<video_id>', methods=['GET'])
@@ -56,10 +59,11 @@ def get_video(video_id):
             }
         })
         
-    except Exception as e:
+    except Exception:
+        current_app.logger.exception('Error retrieving video')
         return jsonify({
             'success': False,
-            'message': f'Error retrieving video: {str(e)}'
+            'message': 'Error retrieving video'
         }), 500
 
 @videos_bp.route('/<video_id>/analyze', methods=['POST'])
@@ -79,8 +83,9 @@ def analyze_video(video_id):
             }
         })
         
-    except Exception as e:
+    except Exception:
+        current_app.logger.exception('Error analyzing video')
         return jsonify({
             'success': False,
-            'message': f'Error analyzing video: {str(e)}'
+            'message': 'Error analyzing video'
         }), 500 
\ No newline at end of file
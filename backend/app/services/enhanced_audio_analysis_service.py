@@ -3,19 +3,16 @@ Enhanced Audio Analysis Service with Speaker Diarization
 Extends the base audio analysis with speaker identification for bodycam footage.
 """
 
-import os
 import logging
-import tempfile
 import numpy as np
 import librosa
-import whisper
-import torch
+from numba import njit
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 import re
 from datetime import datetime
-import soundfile as sf
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # For speaker diarization
 try:
@@ -30,12 +27,47 @@ from .audio_analysis_service import (
     AudioAnalysisService, 
     AudioSegment, 
     TranscriptionSegment, 
-    AudioAnalysisResult
+    AudioAnalysisResult,
+    _format_time_range
 )
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+
+@njit(cache=True)
+def _best_overlap_nb(trans_starts, trans_ends, speaker_starts, speaker_ends):
+    """
+    Index of the speaker segment overlapping each transcription segment most (-1 if none).
+    
+    Two-pointer sweep over both lists in start-time order: speakers that end
+    before a transcription segment starts can't overlap any later one, and
+    the scan for each segment stops at the first speaker starting after it ends.
+    """
+    trans_order = np.argsort(trans_starts, kind='mergesort')
+    speaker_order = np.argsort(speaker_starts, kind='mergesort')
+    best_indices = np.full(trans_starts.size, -1, dtype=np.int64)
+    
+    first = 0
+    for i in trans_order:
+        while first < speaker_order.size and speaker_ends[speaker_order[first]] <= trans_starts[i]:
+            first += 1
+        
+        best_overlap = 0.0
+        k = first
+        while k < speaker_order.size and speaker_starts[speaker_order[k]] < trans_ends[i]:
+            j = speaker_order[k]
+            overlap_duration = min(trans_ends[i], speaker_ends[j]) - max(trans_starts[i], speaker_starts[j])
+            if overlap_duration > best_overlap:
+                best_overlap = overlap_duration
+                best_indices[i] = j
+            k += 1
+    return best_indices
+
+
+# Compile the kernel at import so the first analysis doesn't pay the JIT cost
+_best_overlap_nb(np.zeros(1), np.ones(1), np.zeros(1), np.ones(1))
+
+@dataclass(slots=True)
 class SpeakerSegment:
     """Represents a speaker segment with identification"""
     start_time: float
@@ -44,7 +76,7 @@ class SpeakerSegment:
     speaker_label: str  # "Officer with Camera", "Officer 1", "Suspect", etc.
     confidence: float
 
-@dataclass
+@dataclass(slots=True)
 class EnhancedTranscriptionSegment(TranscriptionSegment):
     """Enhanced transcription segment with speaker information"""
     speaker_id: Optional[str] = None
@@ -76,6 +108,22 @@ class EnhancedAudioAnalysisService(AudioAnalysisService):
             'unknown': 'Unknown Speaker'
         }
         
+        # Phrases hinting at a speaker's role, each list compiled into one
+        # alternation. The lookahead reports a match at every position, so
+        # overlapping phrases ("put your hands up") are all counted.
+        officer_indicators = [
+            'you need to', 'come out', 'hands up', 'stop moving', 'get down',
+            'we need', 'put your hands', 'step back', 'calm down', 'dispatch',
+            'backup', 'supervisor', 'officer', 'police', 'department'
+        ]
+        suspect_indicators = [
+            'i need', 'help me', 'i want', 'my kids', 'i don\'t want',
+            'leave me alone', 'get away', 'social worker', 'doctor',
+            'hospital', 'i\'m not', 'why are you'
+        ]
+        self._officer_indicator_re = re.compile(f"(?=({'|'.join(map(re.escape, officer_indicators))}))")
+        self._suspect_indicator_re = re.compile(f"(?=({'|'.join(map(re.escape, suspect_indicators))}))")
+        
         # Initialize speaker diarization if available
         if PYANNOTE_AVAILABLE:
             self._initialize_diarization_pipeline()
@@ -103,14 +151,19 @@ class EnhancedAudioAnalysisService(AudioAnalysisService):
         try:
             logger.info(f"Starting enhanced audio analysis with speaker diarization for {video_path}")
             
-            # Step 1: Run base audio analysis
-            base_result = super().analyze_video_audio(video_path, model_size)
-            
-            # Step 2: Extract audio for speaker diarization
-            audio_path = self.extract_audio_from_video(video_path)
+            # Step 1: Decode the audio track once; base analysis and diarization share it
+            y, sr = self.load_audio_from_video(video_path)
             
-            # Step 3: Perform speaker diarization
-            speaker_segments = self._perform_speaker_diarization(audio_path)
+            # Steps 2-3: diarization doesn't depend on the transcript, so it runs on
+            # the CPU in the background while the base analysis transcribes
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                speaker_future = executor.submit(self._perform_speaker_diarization, y, sr)
+                
+                # Step 2: Run base audio analysis
+                base_result = super().analyze_video_audio(video_path, model_size, audio=(y, sr))
+                
+                # Step 3: Perform speaker diarization
+                speaker_segments = speaker_future.result()
             
             # Step 4: Match speakers to transcription segments
             enhanced_segments = self._match_speakers_to_transcription(
@@ -154,43 +207,36 @@ class EnhancedAudioAnalysisService(AudioAnalysisService):
             # Fall back to base analysis if speaker diarization fails
             base_result = super().analyze_video_audio(video_path, model_size)
             return self._convert_to_enhanced_result(base_result)
-        finally:
-            # Cleanup
-            if 'audio_path' in locals() and audio_path and os.path.exists(audio_path):
-                try:
-                    os.unlink(audio_path)
-                except:
-                    pass
     
-    def _perform_speaker_diarization(self, audio_path: str) -> List[SpeakerSegment]:
-        """Perform speaker diarization on audio file"""
+    def _perform_speaker_diarization(self, y: np.ndarray, sr: int) -> List[SpeakerSegment]:
+        """Perform speaker diarization on the decoded 16 kHz audio"""
         speaker_segments = []
         
         try:
             if not PYANNOTE_AVAILABLE or self.diarization_pipeline is None:
                 # Fallback: Use voice activity and simple clustering
-                return self._simple_speaker_detection(audio_path)
-            
-            # Load audio
-            y, sr = librosa.load(audio_path, sr=16000)  # 16kHz for diarization
+                return self._simple_speaker_detection(y, sr)
             
             # For now, implement a simple approach based on audio characteristics
             # In production, you would use the full pyannote pipeline
-            return self._simple_speaker_detection(audio_path)
+            return self._simple_speaker_detection(y, sr)
             
         except Exception as e:
             logger.error(f"Error in speaker diarization: {e}")
-            return self._simple_speaker_detection(audio_path)
+            return self._simple_speaker_detection(y, sr)
     
-    def _simple_speaker_detection(self, audio_path: str) -> List[SpeakerSegment]:
+    def _simple_speaker_detection(self, y: np.ndarray, sr: int) -> List[SpeakerSegment]:
         """Simple speaker detection based on audio characteristics"""
         speaker_segments = []
         
         try:
-            y, sr = librosa.load(audio_path, sr=None)
+            # y is 16 kHz mono whatever the source rate; the coarse
+            # energy/spectral features below carry nothing above 8 kHz
+            hop_length = 512
             
-            # Use MFCC features for simple speaker clustering
-            mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+            # One magnitude STFT (64 ms windows at 16 kHz) feeds both per-frame features;
+            # complex64 keeps the spectrogram and every feature derived from it in float32
+            magnitude = np.abs(librosa.stft(y, n_fft=1024, hop_length=hop_length, dtype=np.complex64))
             
             # Simple approach: detect major audio changes that might indicate speaker changes
             # This is a placeholder - real implementation would use proper clustering
@@ -199,61 +245,67 @@ class EnhancedAudioAnalysisService(AudioAnalysisService):
             # Secondary speakers are other voices at different distances/characteristics
             
             # Segment by energy and spectral characteristics
-            hop_length = 512
-            frame_times = librosa.frames_to_time(np.arange(mfccs.shape[1]), sr=sr, hop_length=hop_length)
+            frame_times = librosa.frames_to_time(np.arange(magnitude.shape[1]), sr=sr, hop_length=hop_length)
+            
+            # Simple energy-based segmentation (frame power straight from the STFT)
+            energy = librosa.feature.rms(S=magnitude, frame_length=1024)[0] ** 2
             
-            # Simple energy-based segmentation
-            energy = np.sum(mfccs**2, axis=0)
+            # Spectral flatness: close, clear speech is tonal (low); distant voices and noise are flatter
+            flatness = librosa.feature.spectral_flatness(S=magnitude)[0]
+            
+            # Whole-signal thresholds, computed once: voice activity (70th) and
+            # loud primary speech (80th) share one partition of the energy array
+            energy_threshold, loud_threshold = np.percentile(energy, [70, 80])
+            flatness_threshold = np.percentile(flatness, 60)
             
             # Find voice activity regions
-            energy_threshold = np.percentile(energy, 70)
             voice_active = energy > energy_threshold
             
-            # Create segments for voice activity
-            in_speech = False
-            start_time = 0
-            current_speaker = "SPEAKER_00"  # Default to primary speaker
-            
-            for i, (time_point, is_active) in enumerate(zip(frame_times, voice_active)):
-                if is_active and not in_speech:
-                    start_time = time_point
-                    in_speech = True
-                elif not is_active and in_speech:
-                    if time_point - start_time > 1.0:  # Minimum 1 second segments
-                        # Simple heuristic: if segment is loud and clear, likely primary officer
-                        # If quieter or different characteristics, likely other speaker
-                        segment_energy = np.mean(energy[max(0, i-10):i])
-                        segment_mfcc_var = np.var(mfccs[:, max(0, i-10):i])
-                        
-                        # Determine speaker based on audio characteristics
-                        if segment_energy > np.percentile(energy, 80) and segment_mfcc_var < np.percentile(np.var(mfccs, axis=1), 60):
-                            speaker_id = "SPEAKER_00"  # Primary officer (camera wearer)
-                            confidence = 0.8
-                        else:
-                            speaker_id = "SPEAKER_01"  # Other speaker
-                            confidence = 0.6
-                        
-                        speaker_segments.append(SpeakerSegment(
-                            start_time=start_time,
-                            end_time=time_point,
-                            speaker_id=speaker_id,
-                            speaker_label=self.speaker_labels.get('primary_officer' if speaker_id == "SPEAKER_00" else 'officer_1'),
-                            confidence=confidence
-                        ))
-                    
-                    in_speech = False
-            
-            # Handle case where audio ends in speech
-            if in_speech and len(frame_times) > 0:
-                end_time = frame_times[-1]
-                if end_time - start_time > 1.0:
-                    speaker_segments.append(SpeakerSegment(
-                        start_time=start_time,
-                        end_time=end_time,
-                        speaker_id="SPEAKER_00",
-                        speaker_label=self.speaker_labels['primary_officer'],
-                        confidence=0.7
-                    ))
+            # Voice-active runs from the edges of the mask: a run ends at its first
+            # inactive frame, or at len(voice_active) when the audio ends in speech
+            edges = np.diff(voice_active.astype(np.int8), prepend=0, append=0)
+            run_starts = np.flatnonzero(edges == 1)
+            run_ends = np.flatnonzero(edges == -1)
+            ends_in_speech = run_ends == len(voice_active)
+            start_times = frame_times[run_starts]
+            end_times = frame_times[np.minimum(run_ends, len(frame_times) - 1)]
+            
+            # Simple heuristic: if segment is loud and clear, likely primary officer
+            # If quieter or different characteristics, likely other speaker.
+            # Both features are averaged over the 10 frames before the run ends
+            window_starts = np.maximum(0, run_ends - 10)
+            window_lengths = run_ends - window_starts
+            energy_cumsum = np.concatenate(([0.0], np.cumsum(energy, dtype=np.float64)))
+            flatness_cumsum = np.concatenate(([0.0], np.cumsum(flatness, dtype=np.float64)))
+            segment_energy = (energy_cumsum[run_ends] - energy_cumsum[window_starts]) / window_lengths
+            segment_flatness = (flatness_cumsum[run_ends] - flatness_cumsum[window_starts]) / window_lengths
+            
+            # Determine speaker based on audio characteristics
+            is_primary = (segment_energy > loud_threshold) & (segment_flatness < flatness_threshold)
+            
+            primary_label = self.speaker_labels['primary_officer']
+            other_label = self.speaker_labels['officer_1']
+            
+            # Minimum 1 second segments
+            for k in np.flatnonzero(end_times - start_times > 1.0):
+                if ends_in_speech[k]:
+                    # Audio ends in speech: attribute it to the primary speaker
+                    speaker_id = "SPEAKER_00"
+                    confidence = 0.7
+                elif is_primary[k]:
+                    speaker_id = "SPEAKER_00"  # Primary officer (camera wearer)
+                    confidence = 0.8
+                else:
+                    speaker_id = "SPEAKER_01"  # Other speaker
+                    confidence = 0.6
+                
+                speaker_segments.append(SpeakerSegment(
+                    start_time=float(start_times[k]),
+                    end_time=float(end_times[k]),
+                    speaker_id=speaker_id,
+                    speaker_label=primary_label if speaker_id == "SPEAKER_00" else other_label,
+                    confidence=confidence
+                ))
             
             logger.info(f"Simple speaker detection found {len(speaker_segments)} speaker segments")
             return speaker_segments
@@ -267,20 +319,16 @@ class EnhancedAudioAnalysisService(AudioAnalysisService):
         """Match speaker segments to transcription segments"""
         enhanced_segments = []
         
-        for trans_seg in transcription_segments:
-            # Find the speaker segment that overlaps most with this transcription segment
-            best_speaker = None
-            best_overlap = 0
-            
-            for speaker_seg in speaker_segments:
-                # Calculate overlap
-                overlap_start = max(trans_seg.start_time, speaker_seg.start_time)
-                overlap_end = min(trans_seg.end_time, speaker_seg.end_time)
-                overlap_duration = max(0, overlap_end - overlap_start)
-                
-                if overlap_duration > best_overlap:
-                    best_overlap = overlap_duration
-                    best_speaker = speaker_seg
+        # Find the speaker segment that overlaps most with each transcription segment
+        best_indices = _best_overlap_nb(
+            np.array([seg.start_time for seg in transcription_segments], dtype=np.float64),
+            np.array([seg.end_time for seg in transcription_segments], dtype=np.float64),
+            np.array([seg.start_time for seg in speaker_segments], dtype=np.float64),
+            np.array([seg.end_time for seg in speaker_segments], dtype=np.float64)
+        )
+        
+        for trans_seg, best_index in zip(transcription_segments, best_indices):
+            best_speaker = speaker_segments[best_index] if best_index >= 0 else None
             
             # Create enhanced segment
             enhanced_seg = EnhancedTranscriptionSegment(
@@ -318,21 +366,10 @@ class EnhancedAudioAnalysisService(AudioAnalysisService):
         for speaker_id, content_list in speaker_content.items():
             content = " ".join(content_list)
             
-            # Look for indicators of different speaker types
-            officer_indicators = [
-                'you need to', 'come out', 'hands up', 'stop moving', 'get down',
-                'we need', 'put your hands', 'step back', 'calm down', 'dispatch',
-                'backup', 'supervisor', 'officer', 'police', 'department'
-            ]
-            
-            suspect_indicators = [
-                'i need', 'help me', 'i want', 'my kids', 'i don\'t want',
-                'leave me alone', 'get away', 'social worker', 'doctor',
-                'hospital', 'i\'m not', 'why are you'
-            ]
-            
-            officer_score = sum(1 for indicator in officer_indicators if indicator in content)
-            suspect_score = sum(1 for indicator in suspect_indicators if indicator in content)
+            # Look for indicators of different speaker types: one scan per list,
+            # scoring each distinct indicator found once
+            officer_score = len(set(self._officer_indicator_re.findall(content)))
+            suspect_score = len(set(self._suspect_indicator_re.findall(content)))
             
             # Determine speaker role
             if speaker_id == "SPEAKER_00":
@@ -388,15 +425,16 @@ class EnhancedAudioAnalysisService(AudioAnalysisService):
             'primary_officer_percentage': 0.0
         }
         
-        total_speech_time = sum(seg.end_time - seg.start_time for seg in speaker_segments)
+        # Talk time per speaker id in one grouped pass over the segments
+        durations = np.fromiter((seg.end_time - seg.start_time for seg in speaker_segments),
+                                dtype=np.float64, count=len(speaker_segments))
+        speaker_ids, inverse = np.unique([seg.speaker_id for seg in speaker_segments], return_inverse=True)
+        talk_times = dict(zip(speaker_ids.tolist(), np.bincount(inverse, weights=durations).tolist()))
+        total_speech_time = float(durations.sum())
         
         # Calculate talk time for each speaker
         for speaker_id, speaker_label in identified_speakers.items():
-            speaker_time = sum(
-                seg.end_time - seg.start_time 
-                for seg in speaker_segments 
-                if seg.speaker_id == speaker_id
-            )
+            speaker_time = talk_times.get(speaker_id, 0)
             
             stats['speaker_talk_time'][speaker_label] = speaker_time
             stats['speaker_talk_percentage'][speaker_label] = (
@@ -468,30 +506,17 @@ class EnhancedAudioAnalysisService(AudioAnalysisService):
         current_speaker = None
         
         for segment in valid_segments:
-            line_parts = []
-            
             # Add speaker label if it changed or if first segment
             if include_speaker_labels and segment.speaker_label != current_speaker:
                 current_speaker = segment.speaker_label
                 formatted_lines.append(f"\n**{current_speaker}:**")
             
-            if include_timestamps:
-                start_min = int(segment.start_time // 60)
-                start_sec = int(segment.start_time % 60)
-                end_min = int(segment.end_time // 60)
-                end_sec = int(segment.end_time % 60)
-                timestamp = f"[{start_min:02d}:{start_sec:02d}-{end_min:02d}:{end_sec:02d}]"
-                line_parts.append(timestamp)
-            
-            line_parts.append(segment.text)
-            
+            confidence_info = ""
             if include_confidence:
-                confidence_info = f"(conf: {segment.confidence:.2f}"
-                if segment.speaker_confidence is not None:
-                    confidence_info += f", speaker: {segment.speaker_confidence:.2f}"
-                confidence_info += ")"
-                line_parts.append(confidence_info)
+                speaker_info = f", speaker: {segment.speaker_confidence:.2f}" if segment.speaker_confidence is not None else ""
+                confidence_info = f" (conf: {segment.confidence:.2f}{speaker_info})"
             
-            formatted_lines.append("  " + " ".join(line_parts))
+            timestamp = f"{_format_time_range(segment.start_time, segment.end_time)} " if include_timestamps else ""
+            formatted_lines.append(f"  {timestamp}{segment.text}{confidence_info}")
         
         return "\n".join(formatted_lines) 
\ No newline at end of file
@@ -4,13 +4,23 @@ Improved version with better violation analysis, transcript integration, and exe
 """
 
 import os
+import sys
 import logging
+import math
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from pathlib import Path
 import base64
 import io
+import tempfile
 import textwrap
+from collections import defaultdict
+from functools import lru_cache
+from itertools import chain
+from xml.sax.saxutils import escape
+
+import numpy as np
+from numba import njit
 
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -18,8 +28,9 @@ from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor, black, white, red, orange, green
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, 
-    PageBreak, Image, KeepTogether
+    PageBreak, Image, KeepTogether, Flowable
 )
+from reportlab.lib.utils import simpleSplit
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
 from reportlab.graphics.shapes import Drawing, Rect
 from reportlab.graphics.charts.barcharts import VerticalBarChart
@@ -28,125 +39,286 @@ from reportlab.lib import colors
 
 logger = logging.getLogger(__name__)
 
+# Frame counts above which confidence statistics go through the numba kernel;
+# below it the JIT dispatch costs more than the Python loop
+JIT_MIN_FRAMES = 256
+
+# Distinct confidence levels are counted only up to this many; the summary just
+# needs to know whether there are two or fewer
+UNIQUE_CONFIDENCE_CAP = 3
+
+
+@njit(cache=True)
+def _confidence_stats_nb(confidences):
+    """Min, max, sum and number of distinct 2-decimal levels (capped at 3) of the frame confidences"""
+    min_conf = confidences[0]
+    max_conf = confidences[0]
+    total_conf = 0.0
+    
+    # Distinct levels only matter up to three (the limited-variation check is
+    # "<= 2"), so remember the first two hundredths buckets and stop comparing
+    # once a third shows up
+    first_level = second_level = -1.0
+    unique_confidences = 0
+    for c in confidences:
+        if c < min_conf:
+            min_conf = c
+        elif c > max_conf:
+            max_conf = c
+        total_conf += c
+        
+        if unique_confidences < UNIQUE_CONFIDENCE_CAP:
+            level = np.floor(c * 100.0 + 0.5)
+            if unique_confidences == 0:
+                first_level = level
+                unique_confidences = 1
+            elif level != first_level and (unique_confidences == 1 or level != second_level):
+                second_level = level
+                unique_confidences += 1
+    return min_conf, max_conf, total_conf, unique_confidences
+
+
+# Compile the kernel at import so the first report doesn't pay the JIT cost
+_confidence_stats_nb(np.zeros(2))
+
+# Concerning-frame counts above which the frame list is drawn straight onto the
+# canvas instead of through Paragraph layout
+CANVAS_FRAME_LIST_MIN = 500
+
+# Sort rank of each severity level when choosing primary concerns (unknown last)
+SEVERITY_RANK = {'high': 0, 'medium': 1, 'low': 2}
+
+
+def _concern_sort_key(violation: Dict[str, Any]):
+    """Sort key for primary concerns: most severe first, then most confident."""
+    return SEVERITY_RANK.get(violation.get('severity', 'low'), 3), -violation.get('confidence', 0)
+
+
+# Violation severity mapping
+VIOLATION_PRIORITIES = {
+    'excessive force': {'severity': 10, 'category': 'Use of Force'},
+    'constitutional violation': {'severity': 9, 'category': 'Civil Rights'},
+    'improper procedure': {'severity': 7, 'category': 'Procedural'},
+    'weapon misuse': {'severity': 8, 'category': 'Use of Force'},
+    'verbal abuse': {'severity': 6, 'category': 'Conduct'},
+    'search seizure': {'severity': 8, 'category': 'Constitutional'},
+    'discrimination': {'severity': 7, 'category': 'Civil Rights'},
+    'unprofessional conduct': {'severity': 5, 'category': 'Conduct'}
+}
+
+# Display forms of the known violation types and severity levels, so report
+# loops look labels up instead of re-casing the same strings per item
+VIOLATION_DISPLAY_NAMES = {v_type: v_type.title() for v_type in VIOLATION_PRIORITIES}
+SEVERITY_DISPLAY_NAMES = {level: level.upper() for level in ('critical', 'high', 'medium', 'low', 'N/A')}
+
+
+@lru_cache(maxsize=1)
+def _build_stylesheet():
+    """
+    Build the report stylesheet and color scheme once per process.
+    
+    Styles are never modified after construction, so every service instance
+    shares the same (styles, colors) pair instead of rebuilding it.
+    """
+    styles = getSampleStyleSheet()
+    
+    # Enhanced color scheme (must be defined before the custom styles)
+    palette = {
+        'primary': HexColor('#1f2937'),      # Dark gray
+        'secondary': HexColor('#374151'),     # Medium gray
+        'accent': HexColor('#3b82f6'),       # Blue
+        'success': HexColor('#10b981'),      # Green
+        'warning': HexColor('#f59e0b'),      # Orange
+        'danger': HexColor('#ef4444'),       # Red
+        'light_gray': HexColor('#f3f4f6'),   # Light gray
+        'border': HexColor('#d1d5db'),       # Border gray
+        'critical': HexColor('#dc2626'),     # Critical red
+        'high': HexColor('#ea580c'),         # High orange
+        'medium': HexColor('#ca8a04'),       # Medium yellow
+        'low': HexColor('#16a34a')           # Low green
+    }
+    
+    # Enhanced title style
+    styles.add(ParagraphStyle(
+        name='EnhancedTitle',
+        parent=styles['Title'],
+        fontSize=24,
+        spaceAfter=30,
+        textColor=palette['primary'],
+        fontName='Helvetica-Bold',
+        alignment=TA_CENTER
+    ))
+    
+    # Critical violation alert style
+    styles.add(ParagraphStyle(
+        name='CriticalViolation',
+        parent=styles['Normal'],
+        fontSize=12,
+        spaceAfter=12,
+        textColor=white,
+        fontName='Helvetica-Bold',
+        backColor=palette['critical'],
+        borderColor=palette['critical'],
+        borderWidth=2,
+        borderPadding=12,
+        alignment=TA_CENTER
+    ))
+    
+    # High priority violation style
+    styles.add(ParagraphStyle(
+        name='HighPriorityViolation',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=10,
+        textColor=palette['critical'],
+        fontName='Helvetica-Bold',
+        backColor=HexColor('#fef2f2'),
+        borderColor=palette['critical'],
+        borderWidth=1,
+        borderPadding=8
+    ))
+    
+    # Medium priority violation style
+    styles.add(ParagraphStyle(
+        name='MediumPriorityViolation',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=10,
+        textColor=palette['warning'],
+        fontName='Helvetica-Bold',
+        backColor=HexColor('#fffbeb'),
+        borderColor=palette['warning'],
+        borderWidth=1,
+        borderPadding=8
+    ))
+    
+    # Transcript style
+    styles.add(ParagraphStyle(
+        name='TranscriptText',
+        parent=styles['Normal'],
+        fontSize=9,
+        fontName='Courier',
+        textColor=HexColor('#374151'),
+        spaceAfter=6,
+        leftIndent=12
+    ))
+    
+    # Executive summary style
+    styles.add(ParagraphStyle(
+        name='ExecutiveSummary',
+        parent=styles['Normal'],
+        fontSize=11,
+        fontName='Helvetica',
+        textColor=HexColor('#1f2937'),
+        spaceAfter=8,
+        alignment=TA_JUSTIFY
+    ))
+    
+    return styles, palette
+
+
+@lru_cache(maxsize=1)
+def _build_table_styles():
+    """
+    Build the fixed table styles once per process.
+    
+    Table.setStyle copies the commands out of a TableStyle, so one instance
+    can style every table that uses it.
+    """
+    _, palette = _build_stylesheet()
+    return {
+        # Executive summary statistics table
+        'stats': TableStyle([
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, palette['border']),
+            ('BACKGROUND', (0, 0), (-1, -1), palette['light_gray']),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('PADDING', (0, 0), (-1, -1), 6)
+        ]),
+        # "Detected Issues" box under each concerning frame
+        'frame_issue': TableStyle([
+            ('BOX', (0,0), (-1,-1), 2, palette['danger']),
+            ('TOPPADDING', (0,0), (-1,-1), 6),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+            ('LEFTPADDING', (0,0), (-1,-1), 6),
+            ('RIGHTPADDING', (0,0), (-1,-1), 6),
+        ])
+    }
+
+
+class FrameSummaryFlowable(Flowable):
+    """
+    One frame's title, summary and detected issues drawn with plain canvas calls.
+    
+    Used for very long frame lists: text is wrapped once with simpleSplit
+    (stringWidth measurements) and drawn with drawString, skipping the markup
+    parsing and line breaking Paragraph does for every flowable.
+    """
+    
+    TITLE_LEADING = 14
+    LEADING = 12
+    PADDING = 6
+    
+    def __init__(self, title: str, summary: str, issues: str, width: float, accent_color):
+        super().__init__()
+        self.title = title
+        self.width = width
+        self.accent_color = accent_color
+        self.summary_lines = simpleSplit(summary, 'Helvetica', 10, width)
+        self.issue_lines = simpleSplit(issues, 'Helvetica', 10, width - 2 * self.PADDING) if issues else []
+        
+        self.height = self.TITLE_LEADING + self.PADDING + self.LEADING * len(self.summary_lines)
+        if self.issue_lines:
+            self.height += self.PADDING + self._issue_box_height()
+        self.height += 8  # Space before the next frame
+    
+    def _issue_box_height(self) -> float:
+        return self.LEADING * len(self.issue_lines) + 2 * self.PADDING
+    
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+    
+    def draw(self):
+        canv = self.canv
+        top = self.height
+        
+        canv.setFont('Helvetica-Bold', 11)
+        canv.drawString(0, top - 11, self.title)
+        top -= self.TITLE_LEADING + self.PADDING
+        
+        canv.setFont('Helvetica', 10)
+        for line in self.summary_lines:
+            canv.drawString(0, top - 10, line)
+            top -= self.LEADING
+        
+        if self.issue_lines:
+            top -= self.PADDING
+            box_height = self._issue_box_height()
+            canv.setStrokeColor(self.accent_color)
+            canv.setLineWidth(2)
+            canv.rect(0, top - box_height, self.width, box_height, stroke=1, fill=0)
+            
+            top -= self.PADDING
+            for line in self.issue_lines:
+                canv.drawString(self.PADDING, top - 10, line)
+                top -= self.LEADING
+
 
 class EnhancedReportGenerationService:
     """Enhanced service for generating comprehensive PDF reports with improved violation analysis."""
     
     def __init__(self):
         """Initialize the enhanced report generation service."""
-        self.styles = getSampleStyleSheet()
-        
-        # Enhanced color scheme (must be defined before _setup_custom_styles)
-        self.colors = {
-            'primary': HexColor('#1f2937'),      # Dark gray
-            'secondary': HexColor('#374151'),     # Medium gray
-            'accent': HexColor('#3b82f6'),       # Blue
-            'success': HexColor('#10b981'),      # Green
-            'warning': HexColor('#f59e0b'),      # Orange
-            'danger': HexColor('#ef4444'),       # Red
-            'light_gray': HexColor('#f3f4f6'),   # Light gray
-            'border': HexColor('#d1d5db'),       # Border gray
-            'critical': HexColor('#dc2626'),     # Critical red
-            'high': HexColor('#ea580c'),         # High orange
-            'medium': HexColor('#ca8a04'),       # Medium yellow
-            'low': HexColor('#16a34a')           # Low green
-        }
-        
-        # Now setup custom styles (after colors are defined)
-        self._setup_custom_styles()
+        # Shared, prebuilt stylesheet and color scheme
+        self.styles, self.colors = _build_stylesheet()
+        self.table_styles = _build_table_styles()
         
         # Violation severity mapping
-        self.violation_priorities = {
-            'excessive force': {'severity': 10, 'category': 'Use of Force'},
-            'constitutional violation': {'severity': 9, 'category': 'Civil Rights'},
-            'improper procedure': {'severity': 7, 'category': 'Procedural'},
-            'weapon misuse': {'severity': 8, 'category': 'Use of Force'},
-            'verbal abuse': {'severity': 6, 'category': 'Conduct'},
-            'search seizure': {'severity': 8, 'category': 'Constitutional'},
-            'discrimination': {'severity': 7, 'category': 'Civil Rights'},
-            'unprofessional conduct': {'severity': 5, 'category': 'Conduct'}
-        }
+        self.violation_priorities = VIOLATION_PRIORITIES
         
         logger.info("EnhancedReportGenerationService initialized")
     
-    def _setup_custom_styles(self):
-        """Setup enhanced custom paragraph styles."""
-        # Enhanced title style
-        self.styles.add(ParagraphStyle(
-            name='EnhancedTitle',
-            parent=self.styles['Title'],
-            fontSize=24,
-            spaceAfter=30,
-            textColor=self.colors['primary'],
-            fontName='Helvetica-Bold',
-            alignment=TA_CENTER
-        ))
-        
-        # Critical violation alert style
-        self.styles.add(ParagraphStyle(
-            name='CriticalViolation',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            spaceAfter=12,
-            textColor=white,
-            fontName='Helvetica-Bold',
-            backColor=self.colors['critical'],
-            borderColor=self.colors['critical'],
-            borderWidth=2,
-            borderPadding=12,
-            alignment=TA_CENTER
-        ))
-        
-        # High priority violation style
-        self.styles.add(ParagraphStyle(
-            name='HighPriorityViolation',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            spaceAfter=10,
-            textColor=self.colors['critical'],
-            fontName='Helvetica-Bold',
-            backColor=HexColor('#fef2f2'),
-            borderColor=self.colors['critical'],
-            borderWidth=1,
-            borderPadding=8
-        ))
-        
-        # Medium priority violation style
-        self.styles.add(ParagraphStyle(
-            name='MediumPriorityViolation',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            spaceAfter=10,
-            textColor=self.colors['warning'],
-            fontName='Helvetica-Bold',
-            backColor=HexColor('#fffbeb'),
-            borderColor=self.colors['warning'],
-            borderWidth=1,
-            borderPadding=8
-        ))
-        
-        # Transcript style
-        self.styles.add(ParagraphStyle(
-            name='TranscriptText',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            fontName='Courier',
-            textColor=HexColor('#374151'),
-            spaceAfter=6,
-            leftIndent=12
-        ))
-        
-        # Executive summary style
-        self.styles.add(ParagraphStyle(
-            name='ExecutiveSummary',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            fontName='Helvetica',
-            textColor=HexColor('#1f2937'),
-            spaceAfter=8,
-            alignment=TA_JUSTIFY
-        ))
-    
     def generate_enhanced_comprehensive_report(self, analysis_results: Dict[str, Any], 
                                              case_info: Dict[str, Any] = None,
                                              output_path: str = None) -> str:
@@ -161,8 +333,10 @@ class EnhancedReportGenerationService:
             
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
+            # Lay the PDF out in memory; the file is written in one go afterwards
+            buffer = io.BytesIO()
             doc = SimpleDocTemplate(
-                output_path,
+                buffer,
                 pagesize=letter,
                 rightMargin=0.75*inch,
                 leftMargin=0.75*inch,
@@ -176,36 +350,49 @@ class EnhancedReportGenerationService:
             violations = analysis_results.get('violations', [])
             primary_concerns = self._get_primary_concerns(violations)
             
-            # Enhanced title page
-            story.extend(self._build_enhanced_title_page(analysis_results, case_info))
-            story.append(PageBreak())
-            
-            # Enhanced executive summary
-            story.extend(self._build_enhanced_executive_summary(analysis_results, primary_concerns))
-            story.append(PageBreak())
-            
-            # Primary concerns and timeline
-            story.extend(self._build_primary_concerns_section(analysis_results, primary_concerns))
-            story.append(PageBreak())
-            
-            # Detected Violations Timeline is now part of the above section
-            
-            # Key Audio Segments Analysis
-            story.extend(self._build_key_audio_segments(analysis_results))
-            story.append(PageBreak())
+            # Derive the per-frame views (concern partition, confidence stats) once
+            # and share them with every section that reads frame_analyses
+            frame_summary = self._summarize_frames(analysis_results.get('frame_analyses', []))
             
-            # Comprehensive frame analysis
-            story.extend(self._build_comprehensive_frame_analysis(analysis_results))
-            story.append(PageBreak())
+            audio_analysis = analysis_results.get('audio_analysis') or {}
             
-            # Enhanced recommendations
-            story.extend(self._build_enhanced_recommendations(analysis_results))
-            story.append(PageBreak())
+            # (include?, builder) per section, in report order. Sections whose
+            # data is absent are skipped entirely rather than laid out as a page
+            # holding only a "no data" line; the title page, executive summary
+            # and primary concerns always appear since they state the findings.
+            sections = [
+                # Enhanced title page
+                (True, lambda: self._build_enhanced_title_page(analysis_results, case_info)),
+                # Enhanced executive summary
+                (True, lambda: self._build_enhanced_executive_summary(analysis_results, primary_concerns, frame_summary)),
+                # Primary concerns and timeline (the violations timeline is part of this section)
+                (True, lambda: self._build_primary_concerns_section(analysis_results, primary_concerns)),
+                # Key Audio Segments Analysis
+                (any(v.get('source') == 'audio' for v in violations), lambda: self._build_key_audio_segments(analysis_results)),
+                # Comprehensive frame analysis
+                (frame_summary['frame_count'] > 0, lambda: self._build_comprehensive_frame_analysis(analysis_results, frame_summary)),
+                # Enhanced recommendations
+                (bool(violations or analysis_results.get('recommendations')), lambda: self._build_enhanced_recommendations(analysis_results)),
+                # Full transcript appendix
+                (bool(audio_analysis.get('transcription_segments')), lambda: self._build_full_transcript_appendix(analysis_results)),
+            ]
             
-            # Full transcript appendix
-            story.extend(self._build_full_transcript_appendix(analysis_results))
+            # Each section is built in isolation: a failure in one (e.g. malformed
+            # audio data) is logged and noted in the PDF instead of losing the report
+            for include, build_section in sections:
+                if not include:
+                    continue
+                try:
+                    section_elements = build_section()
+                except Exception as e:
+                    logger.exception("Error building enhanced report section")
+                    section_elements = [Paragraph(f"Section failed: {escape(str(e))}", self.styles['Normal'])]
+                if story:
+                    story.append(PageBreak())
+                story.extend(section_elements)
             
             doc.build(story)
+            self._write_report_file(output_path, buffer.getvalue())
             
             logger.info(f"Enhanced report generated successfully: {output_path}")
             return output_path
@@ -214,10 +401,65 @@ class EnhancedReportGenerationService:
             logger.error(f"Error generating enhanced report: {str(e)}")
             raise
     
-    def _build_enhanced_executive_summary(self, analysis_results: Dict[str, Any], primary_concerns: List[Dict[str, Any]]) -> List:
-        """Build enhanced executive summary using pre-calculated primary concerns."""
+    def _summarize_frames(self, frame_analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Derive every per-frame view the report sections need in one pass.
+        
+        Returns the frames partitioned into concerning/neutral and, when there
+        are frames, the confidence min/max/average and number of distinct
+        (2-decimal) confidence levels, capped at UNIQUE_CONFIDENCE_CAP.
+        """
+        concerning_frames = []
+        neutral_frames = []
+        min_conf = max_conf = frame_analyses[0].get('confidence', 0) if frame_analyses else 0
+        total_conf = 0
+        
+        if len(frame_analyses) > JIT_MIN_FRAMES:
+            # Long videos: partition in Python, reduce confidences in the compiled kernel
+            for frame in frame_analyses:
+                (concerning_frames if frame.get('concerns_detected', False) else neutral_frames).append(frame)
+            
+            confidences = np.fromiter((f.get('confidence', 0) for f in frame_analyses),
+                                      dtype=np.float64, count=len(frame_analyses))
+            min_conf, max_conf, total_conf, unique_confidences = _confidence_stats_nb(confidences)
+        else:
+            rounded_confidences = set()
+            for frame in frame_analyses:
+                if frame.get('concerns_detected', False):
+                    concerning_frames.append(frame)
+                else:
+                    neutral_frames.append(frame)
+                
+                c = frame.get('confidence', 0)
+                if c < min_conf:
+                    min_conf = c
+                elif c > max_conf:
+                    max_conf = c
+                total_conf += c
+                if len(rounded_confidences) < UNIQUE_CONFIDENCE_CAP:
+                    # Same half-up hundredths bucket as the numba kernel, so the
+                    # count doesn't depend on which path ran
+                    rounded_confidences.add(math.floor(c * 100.0 + 0.5))
+            unique_confidences = len(rounded_confidences)
+        
+        return {
+            'frame_count': len(frame_analyses),
+            'concerning_frames': concerning_frames,
+            'neutral_frames': neutral_frames,
+            'min_confidence': min_conf,
+            'max_confidence': max_conf,
+            'average_confidence': total_conf / len(frame_analyses) if frame_analyses else 0,
+            'unique_confidences': int(unique_confidences)
+        }
+    
+    def _build_enhanced_executive_summary(self, analysis_results: Dict[str, Any], primary_concerns: List[Dict[str, Any]],
+                                          frame_summary: Dict[str, Any] = None) -> List:
+        """Build enhanced executive summary using pre-calculated primary concerns and frame summary."""
         elements = []
         
+        if frame_summary is None:
+            frame_summary = self._summarize_frames(analysis_results.get('frame_analyses', []))
+        
         elements.append(Paragraph("EXECUTIVE SUMMARY", self.styles['Heading1']))
         elements.append(Spacer(1, 12))
         
@@ -228,23 +470,24 @@ class EnhancedReportGenerationService:
         total_frames = analysis_results.get('total_frames_analyzed', 0)
         
         # Confidence analysis - show variation
-        frame_analyses = analysis_results.get('frame_analyses', [])
-        if frame_analyses:
-            confidences = [f.get('confidence', 0) for f in frame_analyses]
-            min_conf = min(confidences) if confidences else 0
-            max_conf = max(confidences) if confidences else 0
-            avg_conf = sum(confidences) / len(confidences) if confidences else 0
+        if frame_summary['frame_count']:
+            min_conf = frame_summary['min_confidence']
+            max_conf = frame_summary['max_confidence']
+            avg_conf = frame_summary['average_confidence']
             
             # Detect if all confidences are the same (potential issue)
-            unique_confidences = len(set(round(c, 2) for c in confidences))
+            unique_confidences = frame_summary['unique_confidences']
+            limited_variation = unique_confidences < UNIQUE_CONFIDENCE_CAP
+            levels_text = unique_confidences if limited_variation else f"{UNIQUE_CONFIDENCE_CAP}+"
             
-            confidence_text = f"""
-            Analysis Confidence Range: {min_conf:.1%} - {max_conf:.1%} (Average: {avg_conf:.1%})
-            Confidence Variation: {unique_confidences} distinct confidence levels across {len(confidences)} frames
-            """
+            confidence_lines = [
+                f"Analysis Confidence Range: {min_conf:.1%} - {max_conf:.1%} (Average: {avg_conf:.1%})",
+                f"Confidence Variation: {levels_text} distinct confidence levels across {frame_summary['frame_count']} frames"
+            ]
             
-            if unique_confidences <= 2:
-                confidence_text += "\n⚠️ Note: Limited confidence variation detected - manual review recommended"
+            if limited_variation:
+                confidence_lines.append("⚠️ Note: Limited confidence variation detected - manual review recommended")
+            confidence_text = "<br/>".join(confidence_lines)
         else:
             confidence_text = "Confidence analysis not available"
         
@@ -276,11 +519,11 @@ class EnhancedReportGenerationService:
         
         # Frame sampling methodology explanation
         extraction_strategy = analysis_results.get('extraction_strategy', 'unknown')
-        sampling_text = f"""
-        Frame Selection Method: {extraction_strategy.title()} sampling
-        Frames Analyzed: {total_frames} from video
-        Coverage: Distributed across non-blackout segments with motion-based prioritization
-        """
+        sampling_text = "<br/>".join([
+            f"Frame Selection Method: {extraction_strategy.title()} sampling",
+            f"Frames Analyzed: {total_frames} from video",
+            "Coverage: Distributed across non-blackout segments with motion-based prioritization"
+        ])
         elements.append(Paragraph("Sampling Methodology:", self.styles['Heading2']))
         elements.append(Paragraph(sampling_text, self.styles['Normal']))
         elements.append(Spacer(1, 12))
@@ -290,23 +533,17 @@ class EnhancedReportGenerationService:
             elements.append(Paragraph("Primary Concerns Identified:", self.styles['Heading2']))
             elements.append(Spacer(1, 8))
             
-            # Group violations by type to avoid duplication
-            violation_types = {}
+            # Group violations by type to avoid duplication; the key is normalized
+            # so "Excessive Force" and "excessive force" land in the same group
+            violation_types = defaultdict(list)
             for violation in violations[:5]:  # Top 5 violations
-                v_type = violation.get('type', 'unknown')
-                if v_type not in violation_types:
-                    violation_types[v_type] = []
-                violation_types[v_type].append(violation)
+                violation_types[sys.intern(violation.get('type', 'unknown').strip().lower())].append(violation)
             
             for i, (v_type, v_list) in enumerate(violation_types.items(), 1):
                 primary_violation = v_list[0]  # Use the highest priority one
                 additional_count = len(v_list) - 1
                 
-                violation_text = self._format_violation_for_executive_summary(primary_violation, i)
-                if additional_count > 0:
-                    violation_text += f" (+{additional_count} similar instances)"
-                    
-                elements.append(Paragraph(violation_text, self.styles['HighPriorityViolation']))
+                elements.append(self._format_violation_for_executive_summary(primary_violation, i, additional_count))
                 elements.append(Spacer(1, 8))
         
         # Quick statistics with better context
@@ -322,14 +559,7 @@ class EnhancedReportGenerationService:
         ]
         
         stats_table = Table(stats_data, colWidths=[2*inch, 2*inch])
-        stats_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, self.colors['border']),
-            ('BACKGROUND', (0, 0), (-1, -1), self.colors['light_gray']),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('PADDING', (0, 0), (-1, -1), 6)
-        ]))
+        stats_table.setStyle(self.table_styles['stats'])
         
         elements.append(stats_table)
         
@@ -340,41 +570,49 @@ class EnhancedReportGenerationService:
         if not violations:
             return []
         
-        # Calculate priority scores
-        for violation in violations:
-            base_priority = 5  # Default priority
-            violation_type = violation.get('type', '').lower()
-            
-            if violation_type in self.violation_priorities:
-                base_priority = self.violation_priorities[violation_type]['severity']
-            
-            confidence = violation.get('confidence', 0.5)
-            priority_score = base_priority * confidence * violation.get('priority_score', 1.0)
-            violation['calculated_priority'] = priority_score
-        
-        # Sort by calculated priority (highest first)
-        sorted_violations = sorted(violations, key=lambda x: x.get('calculated_priority', 0), reverse=True)
-        
-        # Return top violations with priority score > 5.0
-        return [v for v in sorted_violations if v.get('calculated_priority', 0) > 5.0]
+        # Calculate priority scores for all violations at once:
+        # base severity (default 5) * confidence * priority score
+        base_priorities = np.array([
+            self.violation_priorities.get(v.get('type', '').lower(), {}).get('severity', 5) for v in violations
+        ], dtype=np.float64)
+        confidences = np.array([v.get('confidence', 0.5) for v in violations], dtype=np.float64)
+        priority_scores = np.array([v.get('priority_score', 1.0) for v in violations], dtype=np.float64)
+        calculated_priorities = base_priorities * confidences * priority_scores
+        
+        for violation, priority in zip(violations, calculated_priorities.tolist()):
+            violation['calculated_priority'] = priority
+        
+        # Sort by calculated priority (highest first, ties keep input order) and
+        # return top violations with priority score > 5.0
+        order = np.argsort(-calculated_priorities, kind='stable')
+        return [violations[i] for i in order.tolist() if calculated_priorities[i] > 5.0]
     
-    def _format_violation_for_executive_summary(self, violation: Dict[str, Any], index: int) -> str:
-        """Format a violation for the executive summary."""
+    def _format_violation_for_executive_summary(self, violation: Dict[str, Any], index: int,
+                                                additional_count: int = 0) -> Paragraph:
+        """
+        Build the executive-summary paragraph for a violation.
+        
+        The markup is assembled in full (including the "+N similar instances"
+        suffix) before the Paragraph is constructed, so it is parsed once.
+        """
         timestamp = violation.get('timestamp_formatted', 'Unknown time')
-        violation_type = violation.get('type', 'Unknown violation').title()
+        violation_type = violation.get('type', 'Unknown violation')
+        violation_type = VIOLATION_DISPLAY_NAMES.get(violation_type) or violation_type.title()
         confidence = violation.get('confidence', 0)
-        description = violation.get('description', 'No description available')
         
-        # Truncate description for executive summary
-        if len(description) > 150:
-            description = description[:150] + "..."
+        # Truncate description for executive summary at a word boundary; the
+        # result is kept on the violation so re-formatting it is a lookup
+        description = violation.get('_short_desc')
+        if description is None:
+            description = textwrap.shorten(violation.get('description', 'No description available'),
+                                           width=150, placeholder='...')
+            violation['_short_desc'] = description
         
-        formatted_text = f"""
-        <b>{index}. {violation_type}</b> at {timestamp} (Confidence: {confidence:.1%})<br/>
-        {description}
-        """
+        formatted_text = f"<b>{index}. {violation_type}</b> at {timestamp} (Confidence: {confidence:.1%})<br/>{description}"
+        if additional_count > 0:
+            formatted_text += f" (+{additional_count} similar instances)"
         
-        return formatted_text
+        return Paragraph(formatted_text, self.styles['HighPriorityViolation'])
     
     def _get_pertinent_audio_snippet(self, violation: Dict[str, Any], 
                                    analysis_results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -434,10 +672,7 @@ class EnhancedReportGenerationService:
     def _get_primary_concerns(self, violations: List[Dict[str, Any]], count: int = 4) -> List[Dict[str, Any]]:
         """Selects the most severe and confident violations as primary concerns."""
         # Sort by severity (high > medium > low) and then by confidence
-        def severity_key(v):
-            return ({'high': 0, 'medium': 1, 'low': 2}.get(v.get('severity', 'low'), 3), -v.get('confidence', 0))
-        
-        return sorted(violations, key=severity_key)[:count]
+        return sorted(violations, key=_concern_sort_key)[:count]
 
     def _format_concern_for_summary(self, concern: Dict[str, Any], index: int) -> str:
         """Formats a single concern for the executive summary table."""
@@ -471,9 +706,10 @@ class EnhancedReportGenerationService:
             return elements
             
         for item in timeline:
+            severity = item.get('severity', 'N/A')
             item_text = (
                 f"<b>- {item.get('timestamp_formatted', 'N/A')} (Confidence: {item.get('confidence', 0):.1%}, "
-                f"Severity: {item.get('severity', 'N/A').upper()})</b><br/>"
+                f"Severity: {SEVERITY_DISPLAY_NAMES.get(severity) or severity.upper()})</b><br/>"
                 f"<i>{item.get('description', 'No details available.')}</i>"
             )
             elements.append(Paragraph(item_text, self.styles['Normal']))
@@ -511,45 +747,53 @@ class EnhancedReportGenerationService:
             
         return elements
 
-    def _build_comprehensive_frame_analysis(self, analysis_results: Dict[str, Any]) -> List:
+    def _build_comprehensive_frame_analysis(self, analysis_results: Dict[str, Any],
+                                            frame_summary: Dict[str, Any] = None) -> List:
         """Build comprehensive analysis of all frames."""
         elements = []
         
+        if frame_summary is None:
+            frame_summary = self._summarize_frames(analysis_results.get('frame_analyses', []))
+        
         elements.append(Paragraph("COMPREHENSIVE FRAME ANALYSIS", self.styles['Heading1']))
         elements.append(Spacer(1, 12))
         
-        frame_analyses = analysis_results.get('frame_analyses', [])
-        
         elements.append(Paragraph(
-            f"This section provides analysis for all {len(frame_analyses)} frames examined. "
+            f"This section provides analysis for all {frame_summary['frame_count']} frames examined. "
             "Frames are organized by significance and potential concerns.",
             self.styles['Normal']
         ))
         elements.append(Spacer(1, 12))
         
-        # Group frames by concern level
-        concerning_frames = [f for f in frame_analyses if f.get('concerns_detected', False)]
-        neutral_frames = [f for f in frame_analyses if not f.get('concerns_detected', False)]
+        # Frames grouped by concern level
+        concerning_frames = frame_summary['concerning_frames']
+        neutral_frames = frame_summary['neutral_frames']
         
         # Show concerning frames first
         if concerning_frames:
             elements.append(Paragraph("Frames with Detected Concerns:", self.styles['Heading2']))
             elements.append(Spacer(1, 8))
             
-            for frame in concerning_frames:
-                elements.extend(self._format_frame_analysis(frame, detailed=True))
-                elements.append(Spacer(1, 8))
+            if len(concerning_frames) > CANVAS_FRAME_LIST_MIN:
+                # Very long lists: fixed-size canvas-drawn blocks, no Paragraph layout
+                elements.extend(self._format_frame_analysis_canvas(frame) for frame in concerning_frames)
+            else:
+                # One block (frame flowables + trailing spacer) per frame, flattened in one extend
+                elements.extend(chain.from_iterable(
+                    self._format_frame_analysis(frame, detailed=True) + [Spacer(1, 8)]
+                    for frame in concerning_frames
+                ))
         
         # Summary of neutral frames
         if neutral_frames:
             elements.append(Paragraph("Neutral Frames Summary:", self.styles['Heading2']))
             elements.append(Spacer(1, 8))
             
-            neutral_text = f"""
-            {len(neutral_frames)} frames showed no significant concerns. These frames 
-            primarily contained routine interactions or environmental footage without 
-            detected violations or concerning behavior.
-            """
+            neutral_text = (
+                f"{len(neutral_frames)} frames showed no significant concerns. These frames "
+                "primarily contained routine interactions or environmental footage without "
+                "detected violations or concerning behavior."
+            )
             elements.append(Paragraph(neutral_text, self.styles['Normal']))
         
         return elements
@@ -581,19 +825,28 @@ class EnhancedReportGenerationService:
             # Create a Paragraph with a red border, but use a Table to contain it
             issue_paragraph = Paragraph(issues_text, style=self.styles['Normal'])
             issue_table = Table([[issue_paragraph]], colWidths=[6.5 * inch])
-            issue_table.setStyle(TableStyle([
-                ('BOX', (0,0), (-1,-1), 2, self.colors['danger']),
-                ('TOPPADDING', (0,0), (-1,-1), 6),
-                ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-                ('LEFTPADDING', (0,0), (-1,-1), 6),
-                ('RIGHTPADDING', (0,0), (-1,-1), 6),
-            ]))
+            issue_table.setStyle(self.table_styles['frame_issue'])
             
             frame_elements.append(issue_table)
             frame_elements.append(Spacer(1, 10))
             
         return [KeepTogether(frame_elements)]
 
+    def _format_frame_analysis_canvas(self, frame: Dict[str, Any]) -> FrameSummaryFlowable:
+        """Formats a single frame analysis as a canvas-drawn block for very long frame lists."""
+        title = (
+            f"Frame {frame.get('frame_number', 'N/A')} - "
+            f"{self._format_timestamp(frame.get('timestamp', 0))} "
+            f"(Confidence: {frame.get('confidence', 0):.1%})"
+        )
+        summary = self._summarize_text(frame.get('analysis_text', 'No analysis text available.'), max_sentences=3)
+        
+        issues = None
+        if frame.get('concerns_detected') and frame.get('potential_violations'):
+            issues = "Detected Issues: " + ", ".join(frame.get('potential_violations'))
+        
+        return FrameSummaryFlowable(title, summary, issues, 6.5 * inch, self.colors['danger'])
+
     def _summarize_text(self, text: str, max_sentences: int = 3) -> str:
         """A simple text summarizer to extract key sentences."""
         # A more sophisticated NLP model could be used here.
@@ -670,22 +923,14 @@ class EnhancedReportGenerationService:
             elements.append(Paragraph("No audio transcript available.", self.styles['Normal']))
             return elements
         
-        for segment in segments:
-            # Handle both object (dataclass) and dict style access safely
-            if hasattr(segment, 'text') and hasattr(segment, 'start_time'):
-                start_time_val = segment.start_time
-                end_time_val = segment.end_time
-                text = segment.text
-            elif isinstance(segment, dict):
-                start_time_val = segment.get('start_time', 0)
-                end_time_val = segment.get('end_time', 0)
-                text = segment.get('text', '')
-            else:
-                logger.warning(f"Skipping unknown segment type in transcript appendix: {type(segment)}")
+        # Every readable segment is kept in the appendix; ones the audio
+        # service flagged as likely hallucinations are marked, not dropped
+        for segment in map(self._normalize_segment, segments):
+            if segment is None:
                 continue
-
-            start_time = self._format_timestamp(start_time_val)
-            end_time = self._format_timestamp(end_time_val)
+            
+            start_time = self._format_timestamp(segment['start_time'])
+            end_time = self._format_timestamp(segment['end_time'])
             
             # Header paragraph for the segment
             header_paragraph = Paragraph(
@@ -696,12 +941,47 @@ class EnhancedReportGenerationService:
             elements.append(Spacer(1, 6))
 
             # Body paragraph, which is allowed to split across pages naturally
-            body_paragraph = Paragraph(text, self.styles['TranscriptText'])
+            body_text = segment['text']
+            if segment['is_hallucination']:
+                body_text = f"<i>[possible hallucination] {body_text}</i>"
+            body_paragraph = Paragraph(body_text, self.styles['TranscriptText'])
             elements.append(body_paragraph)
             elements.append(Spacer(1, 18)) # Add space after each segment
             
         return elements
     
+    def _normalize_segment(self, segment: Any) -> Optional[Dict[str, Any]]:
+        """
+        Normalize a transcription segment to a plain dict.
+        
+        Segments arrive either as dataclass instances (straight from the audio
+        service) or as dicts (after serialization); this branches on the type
+        once so callers read fixed keys. Returns None for unknown types.
+        """
+        if isinstance(segment, dict):
+            return {
+                'start_time': segment.get('start_time', 0),
+                'end_time': segment.get('end_time', 0),
+                'text': segment.get('text', ''),
+                'confidence': segment.get('confidence', 0),
+                'speaker_label': segment.get('speaker_label') or 'Unknown Speaker',
+                'is_hallucination': segment.get('is_hallucination', False)
+            }
+        
+        # Handle object (dataclass) style access safely
+        if hasattr(segment, 'text') and hasattr(segment, 'start_time'):
+            return {
+                'start_time': segment.start_time,
+                'end_time': segment.end_time,
+                'text': segment.text,
+                'confidence': getattr(segment, 'confidence', 0),
+                'speaker_label': getattr(segment, 'speaker_label', None) or 'Unknown Speaker',
+                'is_hallucination': getattr(segment, 'is_hallucination', False)
+            }
+        
+        logger.warning(f"Skipping unknown segment type in transcript: {type(segment)}")
+        return None
+    
     def generate_enhanced_summary_report(self, analysis_results: Dict[str, Any], 
                                        output_path: str = None) -> str:
         """Generate enhanced executive summary report."""
@@ -712,17 +992,21 @@ class EnhancedReportGenerationService:
             
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
-            doc = SimpleDocTemplate(output_path, pagesize=letter)
+            buffer = io.BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=letter)
             story = []
             
+            primary_concerns = self._get_primary_concerns(analysis_results.get('violations', []))
+            
             # Enhanced executive summary only
-            story.extend(self._build_enhanced_executive_summary(analysis_results))
+            story.extend(self._build_enhanced_executive_summary(analysis_results, primary_concerns))
             story.append(Spacer(1, 20))
             
             # Priority violations only
-            story.extend(self._build_primary_concerns(analysis_results))
+            story.extend(self._build_primary_concerns_section(analysis_results, primary_concerns))
             
             doc.build(story)
+            self._write_report_file(output_path, buffer.getvalue())
             
             logger.info(f"Enhanced summary report generated: {output_path}")
             return output_path
@@ -808,17 +1092,35 @@ class EnhancedReportGenerationService:
         elements.append(Spacer(1, 1*inch))
         
         # Legal disclaimer
-        disclaimer_text = """
-        <b>ENHANCED ANALYSIS DISCLAIMER:</b> This report is generated using advanced AI 
-        analysis and should be used as a supplementary tool for investigation purposes only. 
-        All findings should be verified through manual review and additional investigation. 
-        This analysis does not constitute legal advice or definitive evidence.
-        """
+        disclaimer_text = (
+            "<b>ENHANCED ANALYSIS DISCLAIMER:</b> This report is generated using advanced AI "
+            "analysis and should be used as a supplementary tool for investigation purposes only. "
+            "All findings should be verified through manual review and additional investigation. "
+            "This analysis does not constitute legal advice or definitive evidence."
+        )
         
         elements.append(Paragraph(disclaimer_text, self.styles['Normal']))
         
         return elements
 
+    def _write_report_file(self, output_path: str, pdf_bytes: bytes):
+        """
+        Write a rendered PDF to output_path atomically.
+        
+        The bytes go to a uniquely named temporary file in the same directory
+        which then replaces the target, so readers never see a partially
+        written report and concurrent builds of one path don't share a file.
+        """
+        temp_fd, tmp_path = tempfile.mkstemp(suffix=".pdf", dir=os.path.dirname(output_path) or None)
+        try:
+            with os.fdopen(temp_fd, 'wb') as fh:
+                fh.write(pdf_bytes)
+            os.replace(tmp_path, output_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
     def _format_timestamp(self, seconds: float) -> str:
         """Helper function to format seconds into MM:SS."""
         if seconds is None:
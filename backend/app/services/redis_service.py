@@ -255,6 +255,21 @@ class RedisService:
         cache_key = f"analysis:{video_path}:{frame_hash}"
         return self.cache_get(cache_key)
     
+    def cache_case_stats(self, user_id: str, stats: Dict[str, Any], ttl: int = 300) -> bool:
+        """Cache a user's case statistics."""
+        cache_key = f"case_stats:{user_id}"
+        return self.cache_set(cache_key, stats, ttl)
+    
+    def get_cached_case_stats(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get a user's cached case statistics."""
+        cache_key = f"case_stats:{user_id}"
+        return self.cache_get(cache_key)
+    
+    def invalidate_case_stats(self, user_id: str) -> int:
+        """Drop a user's cached case statistics after their cases change."""
+        cache_key = f"case_stats:{user_id}"
+        return self.delete(cache_key)
+    
     def get_usage_stats(self) -> Dict[str, Any]:
         """Get Redis usage statistics."""
         return {
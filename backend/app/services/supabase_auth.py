@@ -10,6 +10,18 @@ from typing import Optional, Dict, Any
 from flask import current_app
 
 
+# Seconds the fetched JWKS document is reused before it is fetched again
+JWKS_CACHE_TTL = int(os.getenv('SUPABASE_JWKS_CACHE_TTL', '600'))
+
+# Algorithms Supabase signs access tokens with: HS256 for the legacy shared
+# secret, RS256/ES256 for asymmetric signing keys published via JWKS
+SYMMETRIC_ALGORITHMS = ['HS256']
+ASYMMETRIC_ALGORITHMS = ['RS256', 'ES256']
+
+# Timeout (seconds) for Supabase Auth admin API calls
+SUPABASE_HTTP_TIMEOUT = float(os.getenv('SUPABASE_HTTP_TIMEOUT', '10'))
+
+
 class SupabaseAuthService:
     """Service for Supabase Authentication operations."""
     
@@ -21,6 +33,40 @@ class SupabaseAuthService:
         
         if not all([self.supabase_url, self.supabase_anon_key, self.jwt_secret]):
             raise ValueError("Missing required Supabase environment variables")
+        
+        # The JWKS set and the resolved signing keys are cached in-process, so
+        # the network is only hit once per TTL window rather than per request.
+        self.jwks_client = jwt.PyJWKClient(
+            f'{self.supabase_url}/auth/v1/.well-known/jwks.json',
+            cache_jwk_set=True,
+            lifespan=JWKS_CACHE_TTL,
+            cache_keys=True,
+            max_cached_keys=16
+        )
+        
+        # Keep-alive connection pool shared by all admin API calls
+        self.http = requests.Session()
+        self.http.headers.update({
+            'Authorization': f'Bearer {self.supabase_service_key}',
+            'apikey': self.supabase_service_key,
+            'Content-Type': 'application/json'
+        })
+    
+    def _get_signing_key(self, token: str):
+        """
+        Resolve the key that verifies a token's signature.
+        
+        Args:
+            token: JWT token from Supabase Auth
+            
+        Returns:
+            Tuple of (key, allowed algorithms)
+        """
+        header = jwt.get_unverified_header(token)
+        if header.get('alg') in SYMMETRIC_ALGORITHMS:
+            return self.jwt_secret, SYMMETRIC_ALGORITHMS
+        
+        return self.jwks_client.get_signing_key_from_jwt(token).key, ASYMMETRIC_ALGORITHMS
     
     def verify_jwt_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
@@ -33,26 +79,17 @@ class SupabaseAuthService:
             User data if token is valid, None otherwise
         """
         try:
-            # For Supabase, we need to verify without signature verification
-            # since we don't have access to their private key in development
-            # In production, you'd want to fetch the public key from Supabase
+            key, algorithms = self._get_signing_key(token)
+            
+            # Signature, expiry and audience are all checked by PyJWT, which
+            # delegates the crypto to the OpenSSL-backed cryptography package
             payload = jwt.decode(
                 token,
-                options={"verify_signature": False},
-                algorithms=['HS256', 'RS256']
+                key,
+                algorithms=algorithms,
+                audience='authenticated'
             )
             
-            # Basic validation - check if token is for authenticated users
-            if payload.get('aud') != 'authenticated':
-                current_app.logger.warning("JWT token not for authenticated audience")
-                return None
-            
-            # Check if token is expired
-            import time
-            if payload.get('exp') and payload.get('exp') < time.time():
-                current_app.logger.warning("JWT token has expired")
-                return None
-            
             return {
                 'user_id': payload.get('sub'),
                 'email': payload.get('email'),
@@ -64,6 +101,12 @@ class SupabaseAuthService:
         except jwt.ExpiredSignatureError:
             current_app.logger.warning("JWT token has expired")
             return None
+        except jwt.InvalidAudienceError:
+            current_app.logger.warning("JWT token not for authenticated audience")
+            return None
+        except jwt.PyJWKClientError as e:
+            current_app.logger.warning(f"Unable to resolve JWT signing key: {str(e)}")
+            return None
         except jwt.InvalidTokenError as e:
             current_app.logger.warning(f"Invalid JWT token: {str(e)}")
             return None
@@ -80,15 +123,9 @@ class SupabaseAuthService:
             User data if found, None otherwise
         """
         try:
-            headers = {
-                'Authorization': f'Bearer {self.supabase_service_key}',
-                'apikey': self.supabase_service_key,
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.get(
+            response = self.http.get(
                 f'{self.supabase_url}/auth/v1/admin/users/{user_id}',
-                headers=headers
+                timeout=SUPABASE_HTTP_TIMEOUT
             )
             
             if response.status_code == 200:
@@ -115,12 +152,6 @@ class SupabaseAuthService:
             Created user data if successful, None otherwise
         """
         try:
-            headers = {
-                'Authorization': f'Bearer {self.supabase_service_key}',
-                'apikey': self.supabase_service_key,
-                'Content-Type': 'application/json'
-            }
-            
             data = {
                 'email': email,
                 'password': password,
@@ -130,10 +161,10 @@ class SupabaseAuthService:
             if user_metadata:
                 data['user_metadata'] = user_metadata
             
-            response = requests.post(
+            response = self.http.post(
                 f'{self.supabase_url}/auth/v1/admin/users',
-                headers=headers,
-                json=data
+                json=data,
+                timeout=SUPABASE_HTTP_TIMEOUT
             )
             
             if response.status_code == 200:
@@ -159,16 +190,10 @@ class SupabaseAuthService:
             Updated user data if successful, None otherwise
         """
         try:
-            headers = {
-                'Authorization': f'Bearer {self.supabase_service_key}',
-                'apikey': self.supabase_service_key,
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.put(
+            response = self.http.put(
                 f'{self.supabase_url}/auth/v1/admin/users/{user_id}',
-                headers=headers,
-                json=updates
+                json=updates,
+                timeout=SUPABASE_HTTP_TIMEOUT
             )
             
             if response.status_code == 200:
@@ -193,15 +218,9 @@ class SupabaseAuthService:
             True if successful, False otherwise
         """
         try:
-            headers = {
-                'Authorization': f'Bearer {self.supabase_service_key}',
-                'apikey': self.supabase_service_key,
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.delete(
+            response = self.http.delete(
                 f'{self.supabase_url}/auth/v1/admin/users/{user_id}',
-                headers=headers
+                timeout=SUPABASE_HTTP_TIMEOUT
             )
             
             return response.status_code == 200
@@ -3,6 +3,7 @@ Custom authentication decorators for Supabase JWT tokens.
 """
 
 from functools import wraps
+from uuid import UUID
 from flask import request, jsonify, g
 from ..services.supabase_auth import supabase_auth
 
@@ -11,6 +12,8 @@ def supabase_jwt_required(f):
     """
     Decorator to require valid Supabase JWT token.
     Sets g.current_user_id with the authenticated user's ID.
+    The token is verified exactly once per request; handlers read the
+    cached claims from g instead of re-parsing the header.
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -44,8 +47,19 @@ def supabase_jwt_required(f):
                 'message': 'Invalid or expired token'
             }), 401
         
+        # Parse the subject once so queries bind a UUID directly
+        try:
+            user_uuid = UUID(user_data['user_id'])
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'message': 'Invalid or expired token'
+            }), 401
+        
         # Set current user ID in Flask's g object
+        g.jwt_claims = user_data
         g.current_user_id = user_data['user_id']
+        g.current_user_uuid = user_uuid
         g.current_user_email = user_data['email']
         g.current_user_data = user_data
         
@@ -62,6 +76,14 @@ def get_current_user_id():
     return getattr(g, 'current_user_id', None)
 
 
+def get_current_user_uuid():
+    """
+    Get the current authenticated user's ID as a UUID.
+    Must be called within a route decorated with @supabase_jwt_required.
+    """
+    return getattr(g, 'current_user_uuid', None)
+
+
 def get_current_user_email():
     """
     Get the current authenticated user's email.
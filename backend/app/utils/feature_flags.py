@@ -0,0 +1,28 @@
+"""
+Feature flag decorators for routes that are not yet available.
+"""
+
+from functools import wraps
+from flask import current_app, jsonify
+
+
+def feature_required(flag):
+    """
+    Decorator returning 501 immediately while a feature flag is off.
+    Apply it above @supabase_jwt_required so disabled routes skip token
+    verification and database work entirely.
+    
+    Args:
+        flag: Config key holding the feature's on/off state
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not current_app.config.get(flag, False):
+                return jsonify({
+                    'success': False,
+                    'message': 'This feature is not available yet'
+                }), 501
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -0,0 +1,62 @@
+"""
+orjson JSON Provider
+Serializes Flask JSON responses with orjson when it is installed.
+"""
+
+import decimal
+from flask import json
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj):
+    """Serialize types orjson does not handle natively."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj) -> bytes:
+    """
+    Serialize data straight to JSON bytes.
+
+    Uses orjson when installed; otherwise encodes the app provider's output.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_default, option=ORJSONProvider.option)
+    return json.dumps(obj).encode()
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    JSON provider backed by orjson.
+
+    orjson encodes datetimes, UUIDs, enums, dataclasses and numpy values
+    natively and writes bytes directly, so responses skip the str -> bytes
+    re-encode done by the default provider.
+    """
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if ORJSON_AVAILABLE else 0
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize data as a JSON string."""
+        return orjson.dumps(obj, default=_default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize data from a JSON string or bytes."""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Build a JSON response without round-tripping through str."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=self.option),
+            mimetype=self.mimetype
+        )
@@ -71,6 +71,13 @@ class Config:
     MAX_CONTENT_LENGTH = 2 * 1024 * 1024 * 1024  # 2GB max file size
     UPLOAD_EXTENSIONS = ['.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv']
     
+    # Feature Flags
+    # Video listing endpoints answer 501 until the Video model is wired up
+    VIDEOS_ENABLED = os.environ.get('VIDEOS_ENABLED', 'false').lower() == 'true'
+    # Case search uses the search_vector full-text index; enable only after
+    # the column and index from DATABASE_MIGRATIONS.md exist
+    CASE_FULL_TEXT_SEARCH = os.environ.get('CASE_FULL_TEXT_SEARCH', 'false').lower() == 'true'
+    
     # AI Model Configuration
     HUGGINGFACE_API_KEY = os.environ.get('HUGGINGFACE_API_KEY')
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')  # Optional
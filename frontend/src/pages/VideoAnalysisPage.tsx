@@ -45,7 +45,13 @@ const VideoAnalysisPage = () => {
       setVideos(response.data.videos)
       setError(null)
     } catch (err: any) {
-      setError('Failed to load videos')
+      if (err.response?.status === 501) {
+        // Video listing is switched off on the backend (VIDEOS_ENABLED); show an empty list
+        setVideos([])
+        setError(null)
+      } else {
+        setError('Failed to load videos')
+      }
     } finally {
       setLoading(false)
     }